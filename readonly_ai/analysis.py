@@ -3,26 +3,81 @@ AI Article Analyzer
 Scores articles, categorizes them, and extracts tags using Gemini Flash
 """
 
+import os
 import json
+import logging
 import time
-from string import Template
-from typing import Any
-from google.genai import types
+import asyncio
+import hashlib
+from typing import Any, Optional
+from google import genai
+from google.genai import errors, types
 from readonly_ai.utils import setup_gemini, truncate_text, combine_unique_texts
-from readonly_ai.prompts import SCORING_PROMPT_TEMPLATE
+from readonly_ai.prompts import SCORING_PROMPT
 from readonly_ai.database import (
     create_database,
     get_unanalysed_articles,
+    count_unanalysed_articles,
     insert_article_analysis,
+    insert_scoring_batch,
+    get_scoring_batches,
+    delete_scoring_batch,
+    get_cached_analyses,
+    insert_cached_analyses,
 )
 
+logger = logging.getLogger(__name__)
+
 
 # Processing configuration
-BATCH_SIZE = 20
+SCORING_MODEL = "gemini-2.0-flash-lite"
+TARGET_INPUT_TOKENS = 32_000
+MAX_BATCH_ARTICLES = 100  # Keeps the JSON response within max_output_tokens
+CHARS_PER_TOKEN = 4  # Rough estimate, good enough for packing batches
+TITLE_MAX_LENGTH = 500
+CONTENT_MAX_LENGTH = 1000
+FETCH_SIZE = 400
+CONCURRENT_BATCHES = 4
 MAX_CONSECUTIVE_FAILURES = 3
 MAX_RETRIES = 3
 RETRY_DELAY = 5
 
+# Gemini quota for the scoring model, defaulting to the free tier
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+OUTPUT_TOKENS_PER_ARTICLE = 40  # Score, category and a handful of tags
+MIN_RATE_SCALE = 0.125  # Slowest the limiter backs off to after rate limit errors
+
+# Batch jobs in these states will not change any more
+BATCH_JOB_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+BATCH_JOB_SUCCESS_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"}
+
+SCORING_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "score": {"type": "integer"},
+            "category": {"type": "integer"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["score", "category", "tags"],
+    },
+}
+
+SCORING_CONFIG = types.GenerateContentConfig(
+    temperature=0.1,
+    max_output_tokens=8192,
+    response_mime_type="application/json",
+    response_schema=SCORING_RESPONSE_SCHEMA,
+)
+
 # Category mapping for display
 CATEGORY_NAMES = {
     1: "Models & Releases",
@@ -34,88 +89,244 @@ CATEGORY_NAMES = {
 }
 
 
+def read_rate_limit(name: str, default: int) -> int:
+    """Read a positive integer rate limit from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+    if limit <= 0:
+        raise ValueError(f"{name} must be greater than 0, got {limit}")
+    return limit
+
+
+class RateLimiter:
+    """Token buckets that pace Gemini calls to the per-minute request and token quotas"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = float(requests_per_minute)
+        self.available_tokens = float(tokens_per_minute)
+        self.rate_scale = 1.0
+        self.paused_until = 0.0
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self) -> None:
+        """Add the capacity regained since the last refill"""
+        now = time.monotonic()
+        elapsed_minutes = (now - self.updated_at) / 60 * self.rate_scale
+        self.available_requests = min(
+            self.requests_per_minute,
+            self.available_requests + elapsed_minutes * self.requests_per_minute,
+        )
+        self.available_tokens = min(
+            self.tokens_per_minute,
+            self.available_tokens + elapsed_minutes * self.tokens_per_minute,
+        )
+        self.updated_at = now
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request of the given token estimate fits in the quota"""
+        tokens = min(tokens, self.tokens_per_minute)
+
+        # Waiters queue on the lock, so calls go out in arrival order
+        async with self.lock:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+
+                self.refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+
+                missing_minutes = max(
+                    (1 - self.available_requests) / self.requests_per_minute,
+                    (tokens - self.available_tokens) / self.tokens_per_minute,
+                )
+                await asyncio.sleep(missing_minutes * 60 / self.rate_scale)
+
+    def back_off(self, delay: float) -> None:
+        """Pause every caller and slow the refill rate after a rate limit error"""
+        self.refill()
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        self.rate_scale = max(self.rate_scale / 2, MIN_RATE_SCALE)
+
+    def record_success(self) -> None:
+        """Recover the refill rate gradually once calls succeed again"""
+        self.refill()
+        self.rate_scale = min(self.rate_scale * 1.1, 1.0)
+
+
+def get_rate_limit_delay(error: Exception) -> Optional[float]:
+    """Get the seconds to wait from a Gemini rate limit error, None for other errors"""
+    if not isinstance(error, errors.APIError) or error.code != 429:
+        return None
+
+    headers = getattr(error.response, "headers", None) or {}
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, TypeError, ValueError):
+        pass
+
+    # google.rpc.RetryInfo carries the delay as a duration string such as "34s"
+    details = error.details.get("error", {}) if isinstance(error.details, dict) else {}
+    for detail in details.get("details", []):
+        retry_delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+        if isinstance(retry_delay, str) and retry_delay.endswith("s"):
+            try:
+                return float(retry_delay[:-1])
+            except ValueError:
+                pass
+
+    return float(RETRY_DELAY)
+
+
 def create_scoring_prompt(articles: list[tuple[str, str, str]]) -> str:
     """Create prompt for Gemini to analyze articles"""
-    template = Template(SCORING_PROMPT_TEMPLATE)
-
     lines = []
     for i, (article_id, title, content) in enumerate(articles):
-        truncated_title = truncate_text(title, 500)
-        truncated_content = truncate_text(content, 1000)
+        truncated_title = truncate_text(title, TITLE_MAX_LENGTH)
+        truncated_content = truncate_text(content, CONTENT_MAX_LENGTH)
         lines.append(
             f"Article {i+1}:\nTitle: {truncated_title}\nContent: {truncated_content}"
         )
 
-    prompt = template.substitute(articles="\n\n".join(lines), n=len(lines))
+    prompt = SCORING_PROMPT.substitute(articles="\n\n".join(lines), n=len(lines))
     return prompt
 
 
-def analyze_articles_batch_with_retry(
+def estimate_article_tokens(title: str, content: str) -> int:
+    """Estimate the prompt tokens one article adds to a scoring prompt"""
+    prompt_chars = (
+        len(truncate_text(title, TITLE_MAX_LENGTH))
+        + len(truncate_text(content, CONTENT_MAX_LENGTH))
+        + 32  # "Article N:", "Title:" and "Content:" labels
+    )
+    return prompt_chars // CHARS_PER_TOKEN + 1
+
+
+def estimate_batch_tokens(articles: list[tuple[str, str, str]]) -> int:
+    """Estimate the input and output tokens one scoring request will use"""
+    instruction_tokens = len(SCORING_PROMPT.template) // CHARS_PER_TOKEN
+    article_tokens = sum(
+        estimate_article_tokens(title, content) for _, title, content in articles
+    )
+    output_tokens = OUTPUT_TOKENS_PER_ARTICLE * len(articles)
+    return instruction_tokens + article_tokens + output_tokens
+
+
+def pack_articles(
+    articles: list[tuple[str, str, str]],
+) -> list[list[tuple[str, str, str]]]:
+    """Split articles into batches that fill the input token budget"""
+    instruction_tokens = len(SCORING_PROMPT.template) // CHARS_PER_TOKEN
+    batches: list[list[tuple[str, str, str]]] = []
+    batch: list[tuple[str, str, str]] = []
+    batch_tokens = instruction_tokens
+
+    for article in articles:
+        article_tokens = estimate_article_tokens(article[1], article[2])
+        if batch and (
+            batch_tokens + article_tokens > TARGET_INPUT_TOKENS
+            or len(batch) >= MAX_BATCH_ARTICLES
+        ):
+            batches.append(batch)
+            batch = []
+            batch_tokens = instruction_tokens
+        batch.append(article)
+        batch_tokens += article_tokens
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def parse_analyses(
+    response_text: Optional[str], expected_count: int
+) -> list[dict[str, Any]]:
+    """Parse and validate the analyses Gemini returned for a batch of articles"""
+    analyses = json.loads(str(response_text).strip())
+
+    if not isinstance(analyses, list) or len(analyses) != expected_count:
+        raise ValueError(
+            f"Invalid response format: expected {expected_count} analyses, got {len(analyses) if isinstance(analyses, list) else 'non-list'}"
+        )
+
+    # Validate each analysis
+    validated_analyses = []
+    for i, analysis in enumerate(analyses):
+        if not isinstance(analysis, dict) or not all(
+            k in analysis for k in ["score", "category", "tags"]
+        ):
+            raise ValueError(f"Analysis {i+1} is missing required keys: {analysis}")
+        validated_analyses.append(analysis)
+
+    return validated_analyses
+
+
+async def analyze_articles_batch_with_retry(
+    client: genai.Client,
+    rate_limiter: RateLimiter,
     articles: list[tuple[str, str, str]],
 ) -> list[dict[str, Any]]:
     """Analyze a batch of articles with retry logic"""
-    client = setup_gemini()
+    prompt = create_scoring_prompt(articles)
+    estimated_tokens = estimate_batch_tokens(articles)
 
     for attempt in range(MAX_RETRIES):
         try:
-            prompt = create_scoring_prompt(articles)
-
-            response_schema = {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "score": {"type": "integer"},
-                        "category": {"type": "integer"},
-                        "tags": {"type": "array", "items": {"type": "string"}},
-                    },
-                    "required": ["score", "category", "tags"],
-                },
-            }
-
-            response = client.models.generate_content(
-                model="gemini-2.0-flash-lite",
+            await rate_limiter.acquire(estimated_tokens)
+
+            response = await client.aio.models.generate_content(
+                model=SCORING_MODEL,
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.1,
-                    max_output_tokens=2000,
-                    response_mime_type="application/json",
-                    response_schema=response_schema,
-                ),
+                config=SCORING_CONFIG,
             )
 
-            analyses = json.loads(str(response.text).strip())
-
-            if not isinstance(analyses, list) or len(analyses) != len(articles):
-                raise ValueError(
-                    f"Invalid response format: expected {len(articles)} analyses, got {len(analyses) if isinstance(analyses, list) else 'non-list'}"
-                )
-
-            # Validate each analysis
-            validated_analyses = []
-            for i, analysis in enumerate(analyses):
-                if not isinstance(analysis, dict) or not all(
-                    k in analysis for k in ["score", "category", "tags"]
-                ):
-                    raise ValueError(
-                        f"Analysis {i+1} is missing required keys: {analysis}"
-                    )
-                validated_analyses.append(analysis)
-
-            return validated_analyses
+            rate_limiter.record_success()
+            return parse_analyses(response.text, len(articles))
 
         except Exception as e:
-            print(f"[ERROR] Analysis attempt {attempt + 1} failed: {e}")
+            logger.error("Analysis attempt %s failed: %s", attempt + 1, e)
             if attempt < MAX_RETRIES - 1:
-                print(f"[INFO] Retrying in {RETRY_DELAY} seconds...")
-                time.sleep(RETRY_DELAY)
+                rate_limit_delay = get_rate_limit_delay(e)
+                if rate_limit_delay is not None:
+                    # The limiter holds back every other batch for the delay too
+                    logger.info(
+                        "Rate limited, retrying in %s seconds...", rate_limit_delay
+                    )
+                    rate_limiter.back_off(rate_limit_delay)
+                else:
+                    logger.info("Retrying in %s seconds...", RETRY_DELAY)
+                    await asyncio.sleep(RETRY_DELAY)
             else:
-                print(f"[ERROR] All {MAX_RETRIES} analysis attempts failed")
+                logger.error("All %s analysis attempts failed", MAX_RETRIES)
                 return []
 
     return []
 
 
+async def analyze_with_limit(
+    semaphore: asyncio.Semaphore,
+    client: genai.Client,
+    rate_limiter: RateLimiter,
+    articles: list[tuple[str, str, str]],
+) -> list[dict[str, Any]]:
+    """Analyze a batch once a concurrency slot is free"""
+    async with semaphore:
+        return await analyze_articles_batch_with_retry(client, rate_limiter, articles)
+
+
 def prepare_articles_for_analysis(
     unanalysed_dict: dict[str, dict[str, Any]],
 ) -> list[tuple[str, str, str]]:
@@ -137,6 +348,62 @@ def prepare_articles_for_analysis(
     return articles_to_process
 
 
+def get_content_hash(title: str, content: str) -> str:
+    """Hash the article text the scoring prompt actually shows Gemini"""
+    text = (
+        f"{truncate_text(title, TITLE_MAX_LENGTH)}\n"
+        f"{truncate_text(content, CONTENT_MAX_LENGTH)}"
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def apply_cached_analyses(
+    articles: list[tuple[str, str, str]],
+) -> tuple[int, list[tuple[str, str, str]]]:
+    """Store cached analyses for already seen content, returning the count and the rest"""
+    content_hashes = [
+        get_content_hash(title, content) for _, title, content in articles
+    ]
+    cached = get_cached_analyses(content_hashes)
+
+    cached_analyses = []
+    uncached_articles = []
+    for article, content_hash in zip(articles, content_hashes):
+        if content_hash in cached:
+            cached_analyses.append((article[0], *cached[content_hash]))
+        else:
+            uncached_articles.append(article)
+
+    return insert_article_analysis(cached_analyses), uncached_articles
+
+
+def cache_analyses(
+    analysed_articles: list[tuple[tuple[str, str, str], dict[str, Any]]],
+) -> None:
+    """Remember Gemini's analyses by the content hash of each article"""
+    insert_cached_analyses(
+        [
+            (
+                get_content_hash(title, content),
+                analysis["score"],
+                analysis["category"],
+                analysis["tags"],
+            )
+            for (_, title, content), analysis in analysed_articles
+        ]
+    )
+
+
+def prepare_analysis_data(
+    article_ids: list[str], analyses: list[dict[str, Any]]
+) -> list[tuple[str, int, int, list[str]]]:
+    """Pair analyses with their article IDs for database insertion"""
+    return [
+        (article_id, analysis["score"], analysis["category"], analysis["tags"])
+        for article_id, analysis in zip(article_ids, analyses)
+    ]
+
+
 def display_analysis_examples(
     articles: list[tuple[str, str, str]], analyses: list[dict[str, Any]]
 ) -> None:
@@ -147,84 +414,226 @@ def display_analysis_examples(
             category_name = CATEGORY_NAMES.get(analysis["category"], "Unknown")
             tags_preview = analysis["tags"][:3]
 
-            print(
-                f"[DEBUG] Score {analysis['score']}, Category: {category_name}, Tags: {tags_preview}..."
+            logger.debug(
+                "Score %s, Category: %s, Tags: %s...",
+                analysis["score"],
+                category_name,
+                tags_preview,
             )
-            print(f"[DEBUG] Title: {truncate_text(title, 60)}")
+            logger.debug("Title: %s", truncate_text(title, 60))
 
 
 def run_article_analysis() -> None:
     """Article analysis loop (scoring, categorization, tagging)"""
-    print("[INFO] Starting AI article analysis (scoring, categorization, tagging)...")
+    asyncio.run(run_article_analysis_async())
+
+
+async def run_article_analysis_async() -> None:
+    """Analyze articles, sending several Gemini batches concurrently"""
+    logger.info("Starting AI article analysis (scoring, categorization, tagging)...")
 
     try:
         create_database()
+        client = setup_gemini()
+        semaphore = asyncio.Semaphore(CONCURRENT_BATCHES)
+        rate_limiter = RateLimiter(
+            read_rate_limit("GEMINI_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE),
+            read_rate_limit("GEMINI_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE),
+        )
         consecutive_failures = 0
         total_analyzed = 0
 
         while consecutive_failures < MAX_CONSECUTIVE_FAILURES:
-            unanalysed_dict = get_unanalysed_articles(BATCH_SIZE)
+            unanalysed_dict = get_unanalysed_articles(FETCH_SIZE)
 
             if not unanalysed_dict:
-                print("[INFO] No more unanalyzed articles found.")
+                logger.info("No more unanalyzed articles found.")
                 break
 
-            print(
-                f"[INFO] Processing batch of {len(unanalysed_dict)} unique articles..."
+            cached_count, articles_to_process = apply_cached_analyses(
+                prepare_articles_for_analysis(unanalysed_dict)
+            )
+            if cached_count:
+                total_analyzed += cached_count
+                logger.info("Reused %s cached article analyses", cached_count)
+
+            batches = pack_articles(articles_to_process)
+            logger.info(
+                "Processing %s unique articles in %s batches...",
+                len(articles_to_process),
+                len(batches),
             )
 
-            articles_to_process = prepare_articles_for_analysis(unanalysed_dict)
-            analyses = analyze_articles_batch_with_retry(articles_to_process)
-
-            if not analyses:
-                consecutive_failures += 1
-                print(
-                    f"[ERROR] Batch analysis failed. Consecutive failures: {consecutive_failures}"
+            batch_analyses = await asyncio.gather(
+                *(
+                    analyze_with_limit(semaphore, client, rate_limiter, batch)
+                    for batch in batches
                 )
-                if consecutive_failures < MAX_CONSECUTIVE_FAILURES:
-                    print(f"[INFO] Waiting {RETRY_DELAY} seconds before next batch...")
-                    time.sleep(RETRY_DELAY)
-                continue
-
-            consecutive_failures = 0
-
-            # Prepare data for database insertion
-            analysis_data = []
-            for i, (article_id, _, _) in enumerate(articles_to_process):
-                if i < len(analyses):
-                    analysis = analyses[i]
-                    analysis_data.append(
-                        (
-                            article_id,
-                            analysis["score"],
-                            analysis["category"],
-                            analysis["tags"],
-                        )
+            )
+
+            for batch, analyses in zip(batches, batch_analyses):
+                if not analyses:
+                    consecutive_failures += 1
+                    logger.error(
+                        "Batch analysis failed. Consecutive failures: %s",
+                        consecutive_failures,
                     )
+                    continue
+
+                consecutive_failures = 0
 
-            inserted_count = insert_article_analysis(analysis_data)
-            total_analyzed += inserted_count
-            print(f"[INFO] Inserted {inserted_count} article analyses")
+                article_ids = [article_id for article_id, _, _ in batch]
+                inserted_count = insert_article_analysis(
+                    prepare_analysis_data(article_ids, analyses)
+                )
+                cache_analyses(list(zip(batch, analyses)))
+                total_analyzed += inserted_count
+                logger.info("Inserted %s article analyses", inserted_count)
 
-            # Show examples from processed batch
-            display_analysis_examples(articles_to_process, analyses)
+                # Show examples from processed batch
+                display_analysis_examples(batch, analyses)
 
-            time.sleep(1)
+            # The rate limiter paces successful rounds, so only failures wait here
+            if 0 < consecutive_failures < MAX_CONSECUTIVE_FAILURES:
+                logger.info("Waiting %s seconds before next batch...", RETRY_DELAY)
+                await asyncio.sleep(RETRY_DELAY)
 
         if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-            print(
-                f"[ERROR] Stopping after {MAX_CONSECUTIVE_FAILURES} consecutive API failures"
+            logger.error(
+                "Stopping after %s consecutive API failures", MAX_CONSECUTIVE_FAILURES
             )
 
-        print(f"[INFO] Analysis complete. Total articles analyzed: {total_analyzed}")
+        logger.info("Analysis complete. Total articles analyzed: %s", total_analyzed)
 
         # Final stats check
-        remaining_unanalysed_count = len(get_unanalysed_articles())
+        remaining_unanalysed_count = count_unanalysed_articles()
         if remaining_unanalysed_count > 0:
-            print(f"[INFO] Remaining unanalyzed articles: {remaining_unanalysed_count}")
+            logger.info("Remaining unanalyzed articles: %s", remaining_unanalysed_count)
+        else:
+            logger.info("All articles have been analyzed!")
+
+    except Exception as e:
+        logger.error("Article analysis failed: %s", e)
+        raise
+
+
+def submit_analysis_batch_job(client: genai.Client) -> int:
+    """Submit all unanalysed articles as one Gemini batch job, returning the article count"""
+    pending_article_ids = {
+        article_id
+        for request_article_ids in get_scoring_batches().values()
+        for article_ids in request_article_ids
+        for article_id in article_ids
+    }
+    cached_count, articles_to_process = apply_cached_analyses(
+        [
+            article
+            for article in prepare_articles_for_analysis(get_unanalysed_articles())
+            if article[0] not in pending_article_ids
+        ]
+    )
+    if cached_count:
+        logger.info("Reused %s cached article analyses", cached_count)
+
+    if not articles_to_process:
+        logger.info("No unanalyzed articles to submit.")
+        return 0
+
+    batches = pack_articles(articles_to_process)
+    requests = [
+        {
+            "contents": [
+                {"role": "user", "parts": [{"text": create_scoring_prompt(batch)}]}
+            ],
+            "config": SCORING_CONFIG,
+        }
+        for batch in batches
+    ]
+
+    job = client.batches.create(
+        model=SCORING_MODEL,
+        src=requests,
+        config={"display_name": "readonly-ai-analysis"},
+    )
+    insert_scoring_batch(
+        str(job.name), [[article_id for article_id, _, _ in batch] for batch in batches]
+    )
+
+    logger.info(
+        "Submitted batch job %s with %s articles in %s requests",
+        job.name,
+        len(articles_to_process),
+        len(batches),
+    )
+    return len(articles_to_process)
+
+
+def collect_analysis_batch_jobs(client: genai.Client) -> int:
+    """Store the results of finished Gemini batch jobs, returning the analyses inserted"""
+    total_analyzed = 0
+    scoring_batches = get_scoring_batches()
+    if not scoring_batches:
+        return 0
+
+    # Article text for the content hashes the results are cached under
+    articles_by_id = {
+        article[0]: article
+        for article in prepare_articles_for_analysis(get_unanalysed_articles())
+    }
+
+    for name, request_article_ids in scoring_batches.items():
+        job = client.batches.get(name=name)
+        state = job.state.name if job.state else "JOB_STATE_UNSPECIFIED"
+
+        if state not in BATCH_JOB_DONE_STATES:
+            logger.info("Batch job %s is still pending (%s)", name, state)
+            continue
+
+        if state in BATCH_JOB_SUCCESS_STATES:
+            responses = (job.dest.inlined_responses if job.dest else None) or []
+            for article_ids, inlined in zip(request_article_ids, responses):
+                if inlined.error or not inlined.response:
+                    logger.error("Batch request failed in %s: %s", name, inlined.error)
+                    continue
+
+                try:
+                    analyses = parse_analyses(inlined.response.text, len(article_ids))
+                except ValueError as e:
+                    logger.error("Invalid batch response in %s: %s", name, e)
+                    continue
+
+                total_analyzed += insert_article_analysis(
+                    prepare_analysis_data(article_ids, analyses)
+                )
+                cache_analyses(
+                    [
+                        (articles_by_id[article_id], analysis)
+                        for article_id, analysis in zip(article_ids, analyses)
+                        if article_id in articles_by_id
+                    ]
+                )
         else:
-            print("[INFO] All articles have been analyzed!")
+            logger.error("Batch job %s ended in state %s", name, state)
+
+        # Articles left without an analysis are picked up by the next submission
+        delete_scoring_batch(name)
+
+    return total_analyzed
+
+
+def run_batch_article_analysis() -> None:
+    """Collect finished Gemini batch jobs, then submit the remaining articles"""
+    logger.info("Starting batch article analysis...")
+
+    try:
+        create_database()
+        client = setup_gemini()
+
+        total_analyzed = collect_analysis_batch_jobs(client)
+        logger.info("Stored %s analyses from finished batch jobs", total_analyzed)
+
+        submit_analysis_batch_job(client)
 
     except Exception as e:
-        print(f"[ERROR] Article analysis failed: {e}")
+        logger.error("Batch article analysis failed: %s", e)
         raise
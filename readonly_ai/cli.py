@@ -6,18 +6,16 @@ Collects AI news from Reddit, HackerNews, and RSS feeds
 
 import os
 import json
+import logging
 import argparse
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
 
 from dotenv import load_dotenv
 
-from readonly_ai.analysis import run_article_analysis
-from readonly_ai.scrapers import (
-    run_reddit_scraper,
-    run_hackernews_scraper,
-    run_rss_scraper,
-)
-from readonly_ai.summary import run_summary_generator
+from readonly_ai.utils import setup_logging
+
+logger = logging.getLogger(__name__)
 
 # Constants
 DEFAULT_CONFIG_PATH = "./config.json"
@@ -74,44 +72,70 @@ def load_and_validate_config(path: str) -> dict[str, Any]:
 
 def handle_reddit(args: argparse.Namespace) -> None:
     """Handle Reddit scraper command"""
+    from readonly_ai.scrapers.reddit import run_reddit_scraper
+
     try:
         validate_hours_back(args.hb)
         config = load_and_validate_config(args.config)
         run_reddit_scraper(args.hb, config["reddit"])
     except Exception as e:
-        print(f"[ERROR] Reddit scraper failed: {e}")
+        logger.error("Reddit scraper failed: %s", e)
         raise
 
 
 def handle_hackernews(args: argparse.Namespace) -> None:
     """Handle HackerNews scraper command"""
+    from readonly_ai.scrapers.hackernews import run_hackernews_scraper
+
     try:
         validate_hours_back(args.hb)
         config = load_and_validate_config(args.config)
         run_hackernews_scraper(args.hb, config["hackernews"])
     except Exception as e:
-        print(f"[ERROR] HackerNews scraper failed: {e}")
+        logger.error("HackerNews scraper failed: %s", e)
         raise
 
 
 def handle_rss(args: argparse.Namespace) -> None:
     """Handle RSS scraper command"""
+    from readonly_ai.scrapers.rss import run_rss_scraper
+
     try:
         validate_hours_back(args.hb)
         config = load_and_validate_config(args.config)
-        run_rss_scraper(args.hb, config["rssfeeds"])
+        run_rss_scraper(args.hb, config["rssfeeds"], config.get("rss_unsorted_feeds"))
     except Exception as e:
-        print(f"[ERROR] RSS scraper failed: {e}")
+        logger.error("RSS scraper failed: %s", e)
         raise
 
 
+def run_script(name: str, func: Callable[[], None]) -> bool:
+    """Run one script of the all command, returning whether it succeeded"""
+    try:
+        logger.info("Running %s...", name)
+        func()
+        logger.info("%s completed successfully", name)
+        return True
+    except Exception as e:
+        logger.error("%s failed: %s", name, e)
+        return False
+
+
 def handle_all(args: argparse.Namespace) -> None:
     """Handle all scrapers and analysis command"""
+    from readonly_ai.analysis import run_article_analysis
+    from readonly_ai.database import create_database
+    from readonly_ai.scrapers import (
+        run_reddit_scraper,
+        run_hackernews_scraper,
+        run_rss_scraper,
+    )
+
     try:
         validate_hours_back(args.hb)
         config = load_and_validate_config(args.config)
 
-        print("[INFO] Running all scrapers and analyzers...")
+        logger.info("Running all scrapers and analyzers...")
 
         scrapers = [
             ("Reddit", lambda: run_reddit_scraper(args.hb, config["reddit"])),
@@ -119,49 +143,64 @@ def handle_all(args: argparse.Namespace) -> None:
                 "HackerNews",
                 lambda: run_hackernews_scraper(args.hb, config["hackernews"]),
             ),
-            ("RSS", lambda: run_rss_scraper(args.hb, config["rssfeeds"])),
-            ("Analysis", run_article_analysis),
+            (
+                "RSS",
+                lambda: run_rss_scraper(
+                    args.hb, config["rssfeeds"], config.get("rss_unsorted_feeds")
+                ),
+            ),
+        ]
+
+        # Create the schema up front so the scraper threads never race on DDL
+        create_database()
+
+        # The scrapers hit different hosts, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+            results = list(executor.map(lambda script: run_script(*script), scrapers))
+
+        failed_scrapers = [
+            name for (name, _), succeeded in zip(scrapers, results) if not succeeded
         ]
 
-        failed_scrapers = []
-        for name, func in scrapers:
-            try:
-                print(f"[INFO] Running {name}...")
-                func()
-                print(f"[INFO] {name} completed successfully")
-            except Exception as e:
-                print(f"[ERROR] {name} failed: {e}")
-                failed_scrapers.append(name)
-                print("[INFO] Continuing with next script...")
+        # Analysis scores what the scrapers just stored, so it runs last
+        if not run_script("Analysis", run_article_analysis):
+            failed_scrapers.append("Analysis")
 
         if failed_scrapers:
-            print(f"[INFO] Completed with failures in: {', '.join(failed_scrapers)}")
+            logger.info("Completed with failures in: %s", ", ".join(failed_scrapers))
         else:
-            print("[INFO] All scripts completed successfully!")
+            logger.info("All scripts completed successfully!")
 
     except Exception as e:
-        print(f"[ERROR] All scrapers command failed: {e}")
+        logger.error("All scrapers command failed: %s", e)
         raise
 
 
 def handle_analysis(args: argparse.Namespace) -> None:
     """Handle article analysis command"""
+    from readonly_ai.analysis import run_article_analysis, run_batch_article_analysis
+
     try:
-        run_article_analysis()
+        if args.batch:
+            run_batch_article_analysis()
+        else:
+            run_article_analysis()
     except Exception as e:
-        print(f"[ERROR] Article analysis failed: {e}")
+        logger.error("Article analysis failed: %s", e)
         raise
 
 
 def handle_summary(args: argparse.Namespace) -> None:
     """Handle summary generation command"""
+    from readonly_ai.summary import run_summary_generator
+
     try:
         validate_hours_back(args.hb)
         validate_relevance_score(args.score)
         validate_language(args.language)
         run_summary_generator(args.hb, args.score, args.language)
     except Exception as e:
-        print(f"[ERROR] Summary generation failed: {e}")
+        logger.error("Summary generation failed: %s", e)
         raise
 
 
@@ -218,6 +257,11 @@ def create_parser() -> argparse.ArgumentParser:
     parser_analysis = subparsers.add_parser(
         "analysis", help="Run article analysis (scoring and categorization)"
     )
+    parser_analysis.add_argument(
+        "--batch",
+        action="store_true",
+        help="Collect finished Gemini batch jobs and submit the remaining articles as a new one (half price, results within 24 hours)",
+    )
     parser_analysis.set_defaults(func=handle_analysis)
 
     # Summary generation
@@ -248,15 +292,17 @@ def create_parser() -> argparse.ArgumentParser:
 
 def main() -> None:
     """Main entry point"""
+    setup_logging()
+
     try:
         parser = create_parser()
         args = parser.parse_args()
         args.func(args)
 
     except KeyboardInterrupt:
-        print("\n[INFO] Operation cancelled by user")
+        logger.info("Operation cancelled by user")
     except Exception as e:
-        print(f"[ERROR] Application failed: {e}")
+        logger.error("Application failed: %s", e)
         exit(1)
 
 
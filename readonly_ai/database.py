@@ -4,37 +4,103 @@ Creates and manages SQLite/PostgreSQL database for storing scraped articles
 """
 
 import os
+import io
+import re
+import atexit
+import csv
 import hashlib
 import json
-from typing import Optional, Any
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Any
 from urllib.parse import urlparse, parse_qs, urlencode
 
-from bs4 import BeautifulSoup
-from sqlalchemy import create_engine, text
+from selectolax.lexbor import LexborHTMLParser
+from sqlalchemy import Connection, bindparam, create_engine, event, text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import StaticPool
+
+logger = logging.getLogger(__name__)
 
 # Constants
 DATABASE_TYPE = os.getenv("DATABASE_TYPE", "sqlite").lower()
 DATABASE_PATH = os.getenv("DATABASE_PATH", "ai_news.db")
 DATABASE_URL = os.getenv("DATABASE_URL")
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+POSTGRES_POOL_SIZE = 10
+POSTGRES_MAX_OVERFLOW = 20
+COPY_THRESHOLD = 500
+STREAM_BATCH_SIZE = 1000
+CACHE_LOOKUP_CHUNK_SIZE = 500  # Well under SQLite's bound parameter limit
+RECENT_ARTICLES_WINDOW_HOURS = 168  # Matches the CLI's maximum hours back
+ARTICLE_ID_HASH_MIGRATION = "article_id_blake2b"
+
+# Elements whose contents are not readable text
+NON_TEXT_TAGS = ["script", "style", "template"]
+
+# Applied to every new SQLite connection: WAL lets readers run alongside the
+# writer and NORMAL sync avoids an fsync per commit
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA busy_timeout=5000",  # ms to wait on a locked database
+]
+
+# Applied to read-only SQLite connections used by the reporting queries
+SQLITE_READONLY_PRAGMAS = [
+    "PRAGMA query_only=ON",
+    "PRAGMA mmap_size=1073741824",  # 1 GiB
+    "PRAGMA busy_timeout=5000",
+]
 
-TRACKING_PARAMS = {
-    "utm_source",
-    "utm_medium",
-    "utm_campaign",
-    "utm_term",
-    "utm_content",
-    "fbclid",
-    "gclid",
-    "ref",
+ARTICLE_COLUMNS = [
+    "parser",
     "source",
-    "campaign",
-    "medium",
-    "_ga",
-    "_gid",
-    "mc_cid",
-    "mc_eid",
-}
+    "id",
+    "subset",
+    "thread_url",
+    "title",
+    "content",
+    "date",
+    "article_id",
+    "article_url",
+]
+
+TRACKING_PARAMS = frozenset(
+    {
+        "utm_source",
+        "utm_medium",
+        "utm_campaign",
+        "utm_term",
+        "utm_content",
+        "fbclid",
+        "gclid",
+        "ref",
+        "source",
+        "campaign",
+        "medium",
+        "_ga",
+        "_gid",
+        "mc_cid",
+        "mc_eid",
+    }
+)
+
+# ASCII http(s) URLs without any of these characters are already in the
+# canonical form urlparse would rebuild, so they can be hashed directly
+URL_PARSE_REQUIRED_CHARS = frozenset("?#;[]\t\r\n")
+
+# Queries of unique key=value pairs that parse_qs and urlencode round-trip
+# unchanged, so tracking parameters can be dropped with a plain split
+SIMPLE_QUERY_PATTERN = re.compile(
+    r"[\w.~+-]+=[\w.~+-]+(?:&[\w.~+-]+=[\w.~+-]+)*", re.ASCII
+)
 
 CATEGORY_NAMES = {
     1: "New Models & Releases",
@@ -44,6 +110,33 @@ CATEGORY_NAMES = {
     5: "Policy & Regulation",
     6: "Unrelated",
 }
+# Lower bound of each relevance band, highest first
+RELEVANCE_BANDS = [
+    (80, "High (80-100)"),
+    (50, "Medium (50-79)"),
+    (20, "Low (20-49)"),
+]
+
+
+# Trimmed and truncated in SQL, mirroring utils.truncate_text; the unique
+# index on article_id already guarantees one row per article
+RECENT_ARTICLES_QUERY = """
+    WITH recent AS (
+        SELECT article_id, article_url, date,
+            NULLIF({trim_title}, '') AS title, NULLIF({trim_content}, '') AS content
+        FROM recent_articles
+        WHERE date >= :date_cutoff
+        AND relevance_score >= :min_relevance AND category = :category
+    )
+    SELECT article_id, article_url,
+        CASE WHEN LENGTH(title) > :title_max_length
+            THEN SUBSTR(title, 1, :title_max_length) || '...' ELSE title END AS title,
+        CASE WHEN LENGTH(content) > :content_max_length
+            THEN SUBSTR(content, 1, :content_max_length) || '...' ELSE content END AS content
+    FROM recent
+    ORDER BY date DESC
+"""
+
 
 # SQL Queries for PostgreSQL
 POSTGRES_QUERIES = {
@@ -62,28 +155,85 @@ POSTGRES_QUERIES = {
             FOREIGN KEY (article_id) REFERENCES articles(article_id)
         )
     """,
+    "CREATE_SCORING_BATCHES_TABLE": """
+        CREATE TABLE IF NOT EXISTS scoring_batches (
+            name TEXT PRIMARY KEY, article_ids TEXT NOT NULL, created_at TEXT NOT NULL
+        )
+    """,
+    "CREATE_ANALYSIS_CACHE_TABLE": """
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            content_hash TEXT PRIMARY KEY, relevance_score INTEGER NOT NULL,
+            category INTEGER NOT NULL, tags TEXT NOT NULL
+        )
+    """,
+    "CREATE_SCHEMA_MIGRATIONS_TABLE": """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name TEXT PRIMARY KEY, applied_at TEXT NOT NULL
+        )
+    """,
     "CREATE_ARTICLE_ID_UNIQUE_INDEX": "CREATE UNIQUE INDEX IF NOT EXISTS idx_article_id_unique ON articles (article_id)",
-    "CREATE_DATE_INDEX": "CREATE INDEX IF NOT EXISTS idx_date ON articles (date)",
+    "DROP_LEGACY_DATE_INDEX": "DROP INDEX IF EXISTS idx_date",
+    "CREATE_DATE_INDEX": "CREATE INDEX IF NOT EXISTS idx_date_article_id ON articles (date DESC, article_id)",
     "CREATE_RELEVANCE_SCORE_INDEX": "CREATE INDEX IF NOT EXISTS idx_relevance_score ON articles_analyses (relevance_score)",
-    "CREATE_CATEGORY_INDEX": "CREATE INDEX IF NOT EXISTS idx_category ON articles_analyses (category)",
+    "DROP_LEGACY_CATEGORY_INDEX": "DROP INDEX IF EXISTS idx_category",
+    "CREATE_CATEGORY_INDEX": "CREATE INDEX IF NOT EXISTS idx_category_relevance_score ON articles_analyses (category, relevance_score)",
+    "CREATE_RECENT_ARTICLES": f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS recent_articles AS
+        SELECT a.parser, a.source, a.id, a.subset, a.thread_url, a.title, a.content, a.date,
+            a.article_id, a.article_url, aa.relevance_score, aa.category
+        FROM articles a
+        INNER JOIN articles_analyses aa ON a.article_id = aa.article_id
+        WHERE a.date >= to_char(
+            CURRENT_TIMESTAMP AT TIME ZONE 'UTC' - INTERVAL '{RECENT_ARTICLES_WINDOW_HOURS} hours',
+            'YYYY-MM-DD HH24:MI:SS'
+        )
+    """,
+    "CREATE_RECENT_ARTICLES_KEY_INDEX": "CREATE UNIQUE INDEX IF NOT EXISTS idx_recent_articles_key ON recent_articles (source, id)",
+    "CREATE_RECENT_CATEGORY_DATE_INDEX": "CREATE INDEX IF NOT EXISTS idx_recent_category_date ON recent_articles (category, date)",
+    "REFRESH_RECENT_ARTICLES": "REFRESH MATERIALIZED VIEW CONCURRENTLY recent_articles",
+    "REBUILD_RECENT_ARTICLES": "REFRESH MATERIALIZED VIEW recent_articles",
     "INSERT_ARTICLE": """
         INSERT INTO articles
         (parser, source, id, subset, thread_url, title, content, date, article_id, article_url)
         VALUES (:parser, :source, :id, :subset, :thread_url, :title, :content, :date, :article_id, :article_url)
-        ON CONFLICT (source, id) DO NOTHING
+        ON CONFLICT DO NOTHING
     """,
-    "GET_RECENT_ARTICLES": """
-        SELECT a.parser, a.source, a.id, a.subset, a.thread_url, a.title, a.content, a.date, a.article_id, a.article_url
-        FROM articles a
-        INNER JOIN articles_analyses aa ON a.article_id = aa.article_id
-        WHERE a.date >= (CURRENT_TIMESTAMP - INTERVAL :hours_back_interval HOUR)
-        AND aa.relevance_score >= :min_relevance AND aa.category = :category
-        ORDER BY a.date DESC
+    "CREATE_ARTICLES_STAGING_TABLE": """
+        CREATE TEMP TABLE articles_staging
+        (LIKE articles INCLUDING DEFAULTS) ON COMMIT DROP
+    """,
+    "COPY_ARTICLES_STAGING": f"""
+        COPY articles_staging ({", ".join(ARTICLE_COLUMNS)})
+        FROM STDIN WITH (FORMAT csv)
+    """,
+    "INSERT_ARTICLES_FROM_STAGING": f"""
+        INSERT INTO articles ({", ".join(ARTICLE_COLUMNS)})
+        SELECT {", ".join(ARTICLE_COLUMNS)} FROM articles_staging
+        ON CONFLICT DO NOTHING
     """,
+    "GET_RECENT_ARTICLES": RECENT_ARTICLES_QUERY.format(
+        trim_title="BTRIM(title, E' \\t\\r\\n')",
+        trim_content="BTRIM(content, E' \\t\\r\\n')",
+    ),
     "GET_UNANALYSED_ARTICLES": """
         SELECT a.article_id, a.title, a.content, a.article_url FROM articles a
-        LEFT JOIN articles_analyses aa ON a.article_id = aa.article_id
-        WHERE aa.article_id IS NULL ORDER BY a.date DESC
+        WHERE NOT EXISTS (
+            SELECT 1 FROM articles_analyses aa WHERE aa.article_id = a.article_id
+        )
+        ORDER BY a.date DESC
+    """,
+    "GET_UNANALYSED_ARTICLES_LIMIT": """
+        SELECT a.article_id, a.title, a.content, a.article_url FROM articles a
+        WHERE NOT EXISTS (
+            SELECT 1 FROM articles_analyses aa WHERE aa.article_id = a.article_id
+        )
+        ORDER BY a.date DESC LIMIT :limit_val
+    """,
+    "COUNT_UNANALYSED_ARTICLES": """
+        SELECT COUNT(*) FROM articles a
+        WHERE NOT EXISTS (
+            SELECT 1 FROM articles_analyses aa WHERE aa.article_id = a.article_id
+        )
     """,
     "INSERT_ARTICLE_ANALYSIS": """
         INSERT INTO articles_analyses (article_id, relevance_score, category, tags)
@@ -93,37 +243,96 @@ POSTGRES_QUERIES = {
             category = EXCLUDED.category,
             tags = EXCLUDED.tags
     """,
-    "COUNT_TOTAL_ARTICLES": "SELECT COUNT(*) FROM articles",
-    "COUNT_UNIQUE_ARTICLES": "SELECT COUNT(DISTINCT article_id) FROM articles",
-    "COUNT_BY_PARSER": "SELECT parser, COUNT(*) FROM articles GROUP BY parser",
-    "COUNT_BY_SOURCE": "SELECT source, COUNT(*) FROM articles GROUP BY source",
-    "COUNT_UNSCORED_ARTICLES": "SELECT COUNT(*) FROM articles a LEFT JOIN articles_analyses aa ON a.article_id = aa.article_id WHERE aa.article_id IS NULL",
-    "STATS_BY_RELEVANCE": """
-        SELECT CASE
-            WHEN relevance_score >= 80 THEN 'High (80-100)'
-            WHEN relevance_score >= 50 THEN 'Medium (50-79)'
-            WHEN relevance_score >= 20 THEN 'Low (20-49)'
-            ELSE 'Very Low (0-19)'
-        END as score_range, COUNT(*) as count
-        FROM articles_analyses GROUP BY score_range
-    """,
-    "STATS_BY_CATEGORY": f"""
-        SELECT CASE
-            WHEN category = 1 THEN '{CATEGORY_NAMES[1]}'
-            WHEN category = 2 THEN '{CATEGORY_NAMES[2]}'
-            WHEN category = 3 THEN '{CATEGORY_NAMES[3]}'
-            WHEN category = 4 THEN '{CATEGORY_NAMES[4]}'
-            WHEN category = 5 THEN '{CATEGORY_NAMES[5]}'
-            WHEN category = 6 THEN '{CATEGORY_NAMES[6]}'
-            ELSE 'Unknown'
-        END as category_name, COUNT(*) as count
+    "INSERT_SCORING_BATCH": """
+        INSERT INTO scoring_batches (name, article_ids, created_at)
+        VALUES (:name, :article_ids, :created_at)
+    """,
+    "GET_SCORING_BATCHES": "SELECT name, article_ids FROM scoring_batches ORDER BY created_at",
+    "DELETE_SCORING_BATCH": "DELETE FROM scoring_batches WHERE name = :name",
+    "GET_CACHED_ANALYSES": """
+        SELECT content_hash, relevance_score, category, tags FROM analysis_cache
+        WHERE content_hash IN :content_hashes
+    """,
+    "INSERT_CACHED_ANALYSIS": """
+        INSERT INTO analysis_cache (content_hash, relevance_score, category, tags)
+        VALUES (:content_hash, :relevance_score, :category, :tags)
+        ON CONFLICT (content_hash) DO NOTHING
+    """,
+    "GET_ARTICLE_IDS": "SELECT article_id FROM articles",
+    "SCHEMA_MIGRATION_APPLIED": "SELECT 1 FROM schema_migrations WHERE name = :name",
+    "INSERT_SCHEMA_MIGRATION": """
+        INSERT INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)
+        ON CONFLICT (name) DO NOTHING
+    """,
+    # Default name PostgreSQL gives the articles_analyses.article_id foreign key
+    "DROP_ANALYSIS_ARTICLE_FOREIGN_KEY": "ALTER TABLE articles_analyses DROP CONSTRAINT IF EXISTS articles_analyses_article_id_fkey",
+    "ADD_ANALYSIS_ARTICLE_FOREIGN_KEY": """
+        ALTER TABLE articles_analyses ADD CONSTRAINT articles_analyses_article_id_fkey
+        FOREIGN KEY (article_id) REFERENCES articles(article_id)
+    """,
+    "GET_ARTICLE_URLS": "SELECT source, id, article_id, article_url FROM articles",
+    "UPDATE_ARTICLE_ID": "UPDATE articles SET article_id = :new_article_id WHERE source = :source AND id = :id",
+    "UPDATE_ANALYSIS_ARTICLE_ID": "UPDATE articles_analyses SET article_id = :new_article_id WHERE article_id = :article_id",
+    "GET_DATABASE_STATS": """
+        WITH parser_source_counts AS (
+            SELECT parser, source, COUNT(*) AS count FROM articles GROUP BY parser, source
+        )
+        SELECT 'summary' AS stat, 'total_articles' AS label,
+            CAST(COALESCE(SUM(count), 0) AS BIGINT) AS count
+        FROM parser_source_counts
+        UNION ALL
+        SELECT 'summary' AS stat, 'unique_articles' AS label, COUNT(*) AS count
+        FROM (SELECT article_id FROM articles GROUP BY article_id) AS ids
+        UNION ALL
+        SELECT 'summary' AS stat, 'unscored_articles' AS label, COUNT(*) AS count
+        FROM articles a
+        WHERE NOT EXISTS (
+            SELECT 1 FROM articles_analyses aa WHERE aa.article_id = a.article_id
+        )
+        UNION ALL
+        SELECT 'by_parser' AS stat, parser AS label, CAST(SUM(count) AS BIGINT) AS count
+        FROM parser_source_counts GROUP BY parser
+        UNION ALL
+        SELECT 'by_source' AS stat, source AS label, CAST(SUM(count) AS BIGINT) AS count
+        FROM parser_source_counts GROUP BY source
+        UNION ALL
+        SELECT 'by_relevance' AS stat, CAST(relevance_score AS TEXT) AS label,
+            COUNT(*) AS count
+        FROM articles_analyses GROUP BY relevance_score
+        UNION ALL
+        SELECT 'by_category' AS stat, CAST(category AS TEXT) AS label, COUNT(*) AS count
         FROM articles_analyses GROUP BY category
     """,
 }
 
 # SQL Queries for SQLite
 SQLITE_QUERIES = {
-    "CREATE_ARTICLES_TABLE": POSTGRES_QUERIES["CREATE_ARTICLES_TABLE"],
+    "CREATE_ARTICLES_TABLE": """
+        CREATE TABLE IF NOT EXISTS articles (
+            parser TEXT NOT NULL, source TEXT NOT NULL, id TEXT NOT NULL,
+            subset TEXT, thread_url TEXT, title TEXT NOT NULL, content TEXT,
+            date TEXT NOT NULL, article_id TEXT NOT NULL, article_url TEXT NOT NULL,
+            PRIMARY KEY (source, id)
+        ) WITHOUT ROWID
+    """,
+    "GET_ARTICLES_TABLE_DDL": "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'articles'",
+    "DROP_ARTICLES_WITHOUT_ROWID_TABLE": "DROP TABLE IF EXISTS articles_without_rowid",
+    "CREATE_ARTICLES_WITHOUT_ROWID_TABLE": """
+        CREATE TABLE articles_without_rowid (
+            parser TEXT NOT NULL, source TEXT NOT NULL, id TEXT NOT NULL,
+            subset TEXT, thread_url TEXT, title TEXT NOT NULL, content TEXT,
+            date TEXT NOT NULL, article_id TEXT NOT NULL, article_url TEXT NOT NULL,
+            PRIMARY KEY (source, id)
+        ) WITHOUT ROWID
+    """,
+    "COPY_ARTICLES_WITHOUT_ROWID": """
+        INSERT INTO articles_without_rowid
+        (parser, source, id, subset, thread_url, title, content, date, article_id, article_url)
+        SELECT parser, source, id, subset, thread_url, title, content, date, article_id, article_url
+        FROM articles
+    """,
+    "DROP_ARTICLES_TABLE": "DROP TABLE articles",
+    "RENAME_ARTICLES_WITHOUT_ROWID": "ALTER TABLE articles_without_rowid RENAME TO articles",
     "CREATE_ARTICLES_ANALYSES_TABLE": """
         CREATE TABLE IF NOT EXISTS articles_analyses (
             article_id TEXT PRIMARY KEY, relevance_score INTEGER NOT NULL,
@@ -131,106 +340,404 @@ SQLITE_QUERIES = {
             FOREIGN KEY (article_id) REFERENCES articles(article_id)
         )
     """,
+    "CREATE_SCORING_BATCHES_TABLE": POSTGRES_QUERIES["CREATE_SCORING_BATCHES_TABLE"],
+    "CREATE_ANALYSIS_CACHE_TABLE": POSTGRES_QUERIES["CREATE_ANALYSIS_CACHE_TABLE"],
+    "CREATE_SCHEMA_MIGRATIONS_TABLE": POSTGRES_QUERIES[
+        "CREATE_SCHEMA_MIGRATIONS_TABLE"
+    ],
     "CREATE_ARTICLE_ID_UNIQUE_INDEX": POSTGRES_QUERIES[
         "CREATE_ARTICLE_ID_UNIQUE_INDEX"
     ],
+    "DROP_LEGACY_DATE_INDEX": POSTGRES_QUERIES["DROP_LEGACY_DATE_INDEX"],
     "CREATE_DATE_INDEX": POSTGRES_QUERIES["CREATE_DATE_INDEX"],
     "CREATE_RELEVANCE_SCORE_INDEX": POSTGRES_QUERIES["CREATE_RELEVANCE_SCORE_INDEX"],
+    "DROP_LEGACY_CATEGORY_INDEX": POSTGRES_QUERIES["DROP_LEGACY_CATEGORY_INDEX"],
     "CREATE_CATEGORY_INDEX": POSTGRES_QUERIES["CREATE_CATEGORY_INDEX"],
+    # Only gathers statistics for tables whose statistics are missing or stale
+    "OPTIMIZE_DATABASE": "PRAGMA optimize",
+    "RECENT_ARTICLES_EXISTS": "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recent_articles'",
+    "CREATE_RECENT_ARTICLES": """
+        CREATE TABLE IF NOT EXISTS recent_articles (
+            parser TEXT NOT NULL, source TEXT NOT NULL, id TEXT NOT NULL,
+            subset TEXT, thread_url TEXT, title TEXT NOT NULL, content TEXT,
+            date TEXT NOT NULL, article_id TEXT NOT NULL, article_url TEXT NOT NULL,
+            relevance_score INTEGER NOT NULL, category INTEGER NOT NULL,
+            PRIMARY KEY (source, id)
+        ) WITHOUT ROWID
+    """,
+    "CREATE_RECENT_CATEGORY_DATE_INDEX": POSTGRES_QUERIES[
+        "CREATE_RECENT_CATEGORY_DATE_INDEX"
+    ],
+    "CREATE_RECENT_ARTICLES_ARTICLE_TRIGGER": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_recent_articles_article
+        AFTER INSERT ON articles
+        WHEN NEW.date >= datetime('now', '-{RECENT_ARTICLES_WINDOW_HOURS} hours')
+        BEGIN
+            INSERT OR REPLACE INTO recent_articles
+            SELECT NEW.parser, NEW.source, NEW.id, NEW.subset, NEW.thread_url, NEW.title,
+                NEW.content, NEW.date, NEW.article_id, NEW.article_url,
+                aa.relevance_score, aa.category
+            FROM articles_analyses aa WHERE aa.article_id = NEW.article_id;
+        END
+    """,
+    "CREATE_RECENT_ARTICLES_ANALYSIS_TRIGGER": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_recent_articles_analysis
+        AFTER INSERT ON articles_analyses
+        BEGIN
+            INSERT OR REPLACE INTO recent_articles
+            SELECT a.parser, a.source, a.id, a.subset, a.thread_url, a.title, a.content,
+                a.date, a.article_id, a.article_url, NEW.relevance_score, NEW.category
+            FROM articles a
+            WHERE a.article_id = NEW.article_id
+            AND a.date >= datetime('now', '-{RECENT_ARTICLES_WINDOW_HOURS} hours');
+        END
+    """,
+    "BACKFILL_RECENT_ARTICLES": f"""
+        INSERT OR REPLACE INTO recent_articles
+        SELECT a.parser, a.source, a.id, a.subset, a.thread_url, a.title, a.content, a.date,
+            a.article_id, a.article_url, aa.relevance_score, aa.category
+        FROM articles a
+        INNER JOIN articles_analyses aa ON a.article_id = aa.article_id
+        WHERE a.date >= datetime('now', '-{RECENT_ARTICLES_WINDOW_HOURS} hours')
+    """,
+    "CLEAR_RECENT_ARTICLES": "DELETE FROM recent_articles",
+    "REFRESH_RECENT_ARTICLES": f"""
+        DELETE FROM recent_articles
+        WHERE date < datetime('now', '-{RECENT_ARTICLES_WINDOW_HOURS} hours')
+    """,
     "INSERT_ARTICLE": """
         INSERT OR IGNORE INTO articles
         (parser, source, id, subset, thread_url, title, content, date, article_id, article_url)
         VALUES (:parser, :source, :id, :subset, :thread_url, :title, :content, :date, :article_id, :article_url)
     """,
-    "GET_RECENT_ARTICLES": """
-        SELECT a.parser, a.source, a.id, a.subset, a.thread_url, a.title, a.content, a.date, a.article_id, a.article_url
-        FROM articles a
-        INNER JOIN articles_analyses aa ON a.article_id = aa.article_id
-        WHERE datetime(a.date) >= datetime('now', :hours_back_delta_str)
-        AND aa.relevance_score >= :min_relevance AND aa.category = :category
-        ORDER BY a.date DESC
-    """,
+    "GET_RECENT_ARTICLES": RECENT_ARTICLES_QUERY.format(
+        trim_title="TRIM(title, char(32, 9, 13, 10))",
+        trim_content="TRIM(content, char(32, 9, 13, 10))",
+    ),
     "GET_UNANALYSED_ARTICLES": POSTGRES_QUERIES["GET_UNANALYSED_ARTICLES"],
+    "GET_UNANALYSED_ARTICLES_LIMIT": POSTGRES_QUERIES["GET_UNANALYSED_ARTICLES_LIMIT"],
+    "COUNT_UNANALYSED_ARTICLES": POSTGRES_QUERIES["COUNT_UNANALYSED_ARTICLES"],
     "INSERT_ARTICLE_ANALYSIS": """
         INSERT OR REPLACE INTO articles_analyses (article_id, relevance_score, category, tags)
         VALUES (:article_id, :relevance_score, :category, :tags)
     """,
-    "COUNT_TOTAL_ARTICLES": POSTGRES_QUERIES["COUNT_TOTAL_ARTICLES"],
-    "COUNT_UNIQUE_ARTICLES": POSTGRES_QUERIES["COUNT_UNIQUE_ARTICLES"],
-    "COUNT_BY_PARSER": POSTGRES_QUERIES["COUNT_BY_PARSER"],
-    "COUNT_BY_SOURCE": POSTGRES_QUERIES["COUNT_BY_SOURCE"],
-    "COUNT_UNSCORED_ARTICLES": POSTGRES_QUERIES["COUNT_UNSCORED_ARTICLES"],
-    "STATS_BY_RELEVANCE": POSTGRES_QUERIES["STATS_BY_RELEVANCE"],
-    "STATS_BY_CATEGORY": POSTGRES_QUERIES["STATS_BY_CATEGORY"],
+    "INSERT_SCORING_BATCH": POSTGRES_QUERIES["INSERT_SCORING_BATCH"],
+    "GET_SCORING_BATCHES": POSTGRES_QUERIES["GET_SCORING_BATCHES"],
+    "DELETE_SCORING_BATCH": POSTGRES_QUERIES["DELETE_SCORING_BATCH"],
+    "GET_CACHED_ANALYSES": POSTGRES_QUERIES["GET_CACHED_ANALYSES"],
+    "INSERT_CACHED_ANALYSIS": """
+        INSERT OR IGNORE INTO analysis_cache (content_hash, relevance_score, category, tags)
+        VALUES (:content_hash, :relevance_score, :category, :tags)
+    """,
+    "GET_ARTICLE_IDS": POSTGRES_QUERIES["GET_ARTICLE_IDS"],
+    "SCHEMA_MIGRATION_APPLIED": POSTGRES_QUERIES["SCHEMA_MIGRATION_APPLIED"],
+    "INSERT_SCHEMA_MIGRATION": """
+        INSERT OR IGNORE INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)
+    """,
+    "GET_ARTICLE_URLS": POSTGRES_QUERIES["GET_ARTICLE_URLS"],
+    "UPDATE_ARTICLE_ID": POSTGRES_QUERIES["UPDATE_ARTICLE_ID"],
+    "UPDATE_ANALYSIS_ARTICLE_ID": POSTGRES_QUERIES["UPDATE_ANALYSIS_ARTICLE_ID"],
+    "GET_DATABASE_STATS": POSTGRES_QUERIES["GET_DATABASE_STATS"],
 }
 
 # Select the appropriate query set
 QUERIES = POSTGRES_QUERIES if DATABASE_TYPE == "postgresql" else SQLITE_QUERIES
 
+# Build the text() clauses once so SQLAlchemy's compiled cache is reused
+COMPILED_QUERIES = {name: text(sql) for name, sql in QUERIES.items()}
+COMPILED_QUERIES["GET_CACHED_ANALYSES"] = COMPILED_QUERIES[
+    "GET_CACHED_ANALYSES"
+].bindparams(bindparam("content_hashes", expanding=True))
+
+# article_ids already stored, loaded once per process by get_known_article_ids
+_known_article_ids: Optional[set[str]] = None
+# Scrapers insert from several threads under the all command
+_known_article_ids_lock = threading.Lock()
+
+# Set once create_database has run, so the DDL is only issued once per process
+_schema_ready = False
+
 
 def clean_text(text: Optional[str]) -> Optional[str]:
     """Clean HTML and normalize text encoding"""
     if not text or not isinstance(text, str):
         return None
 
-    soup = BeautifulSoup(text, "html.parser")
-    cleaned = " ".join(soup.get_text().split())
-    cleaned = cleaned.encode("utf-8", errors="ignore").decode("utf-8")
-    return cleaned.strip()
+    # Drop lone surrogates up front; the parser would discard the whole text
+    text = text.encode("utf-8", errors="ignore").decode("utf-8")
 
+    # Without tags, entities or NUL characters there is nothing for the parser to do
+    if "<" not in text and "&" not in text and "\x00" not in text:
+        return " ".join(text.split())
 
+    tree = LexborHTMLParser(text)
+    tree.strip_tags(NON_TEXT_TAGS)
+    return " ".join((tree.text() or "").split())
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune a new SQLite connection for the write-heavy scraper workload"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def set_sqlite_readonly_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune a new read-only SQLite connection for large scans"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_READONLY_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+@functools.lru_cache(maxsize=1)
 def get_database_engine():
-    """Get SQLAlchemy engine based on environment configuration"""
+    """Get the shared SQLAlchemy engine based on environment configuration"""
     if DATABASE_TYPE == "postgresql":
         if not DATABASE_URL:
             raise ValueError("DATABASE_URL must be set when using PostgreSQL")
-        return create_engine(DATABASE_URL)
-    return create_engine(f"sqlite:///{DATABASE_PATH}")
+        # The engine lives for the whole process, so drop stale server connections
+        engine = create_engine(
+            DATABASE_URL,
+            pool_size=POSTGRES_POOL_SIZE,
+            max_overflow=POSTGRES_MAX_OVERFLOW,
+            pool_pre_ping=True,
+        )
+    elif DATABASE_PATH == ":memory:":
+        # Every new connection to :memory: opens a fresh empty database
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(
+            f"sqlite:///{DATABASE_PATH}",
+            connect_args={"check_same_thread": False},
+        )
+        event.listen(engine, "connect", set_sqlite_pragmas)
+
+    atexit.register(engine.dispose)
+    return engine
+
+
+@functools.lru_cache(maxsize=1)
+def get_readonly_engine():
+    """Get the shared engine for read-only queries, separate from writers on SQLite"""
+    if DATABASE_TYPE == "postgresql" or DATABASE_PATH == ":memory:":
+        return get_database_engine()
+
+    engine = create_engine(
+        f"sqlite:///file:{DATABASE_PATH}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", set_sqlite_readonly_pragmas)
+
+    atexit.register(engine.dispose)
+    return engine
+
+
+@contextmanager
+def writer_session() -> Iterator[Connection]:
+    """Open a connection in a transaction, committed on success and rolled back on error"""
+    with get_database_engine().begin() as conn:
+        yield conn
+
+
+def migrate_articles_without_rowid(conn) -> None:
+    """Rebuild a legacy SQLite rowid articles table as a WITHOUT ROWID table"""
+    ddl = conn.execute(COMPILED_QUERIES["GET_ARTICLES_TABLE_DDL"]).scalar_one_or_none()
+    if not ddl or "WITHOUT ROWID" in ddl.upper():
+        return
+
+    logger.info("Migrating articles table to WITHOUT ROWID...")
+    # pysqlite autocommits DDL issued before the first DML statement, so a
+    # previously interrupted migration can leave the new table behind
+    conn.execute(COMPILED_QUERIES["DROP_ARTICLES_WITHOUT_ROWID_TABLE"])
+    conn.execute(COMPILED_QUERIES["CREATE_ARTICLES_WITHOUT_ROWID_TABLE"])
+    conn.execute(COMPILED_QUERIES["COPY_ARTICLES_WITHOUT_ROWID"])
+    conn.execute(COMPILED_QUERIES["DROP_ARTICLES_TABLE"])
+    conn.execute(COMPILED_QUERIES["RENAME_ARTICLES_WITHOUT_ROWID"])
+
+
+def create_recent_articles(conn) -> None:
+    """Create the recent_articles view (PostgreSQL) or trigger-synced table (SQLite)"""
+    if DATABASE_TYPE == "postgresql":
+        conn.execute(COMPILED_QUERIES["CREATE_RECENT_ARTICLES"])
+        conn.execute(COMPILED_QUERIES["CREATE_RECENT_ARTICLES_KEY_INDEX"])
+        conn.execute(COMPILED_QUERIES["CREATE_RECENT_CATEGORY_DATE_INDEX"])
+        return
+
+    exists = conn.execute(COMPILED_QUERIES["RECENT_ARTICLES_EXISTS"]).scalar()
+    conn.execute(COMPILED_QUERIES["CREATE_RECENT_ARTICLES"])
+    conn.execute(COMPILED_QUERIES["CREATE_RECENT_CATEGORY_DATE_INDEX"])
+    conn.execute(COMPILED_QUERIES["CREATE_RECENT_ARTICLES_ARTICLE_TRIGGER"])
+    conn.execute(COMPILED_QUERIES["CREATE_RECENT_ARTICLES_ANALYSIS_TRIGGER"])
+    if not exists:
+        conn.execute(COMPILED_QUERIES["BACKFILL_RECENT_ARTICLES"])
+
+
+def refresh_recent_articles() -> None:
+    """Refresh the recent_articles view (PostgreSQL) or prune expired rows (SQLite)"""
+    try:
+        with get_database_engine().connect() as conn:
+            conn.execute(COMPILED_QUERIES["REFRESH_RECENT_ARTICLES"])
+            conn.commit()
+
+    except SQLAlchemyError as e:
+        logger.error("Database error in refresh_recent_articles: %s", e)
 
 
 def create_database() -> None:
     """Create the database and tables if they don't exist"""
+    global _schema_ready
+    if _schema_ready:
+        return
+
     try:
         engine = get_database_engine()
         with engine.connect() as conn:
-            conn.execute(text(QUERIES["CREATE_ARTICLES_TABLE"]))
-            conn.execute(text(QUERIES["CREATE_ARTICLES_ANALYSES_TABLE"]))
-            conn.execute(text(QUERIES["CREATE_ARTICLE_ID_UNIQUE_INDEX"]))
-            conn.execute(text(QUERIES["CREATE_DATE_INDEX"]))
-            conn.execute(text(QUERIES["CREATE_RELEVANCE_SCORE_INDEX"]))
-            conn.execute(text(QUERIES["CREATE_CATEGORY_INDEX"]))
+            if DATABASE_TYPE != "postgresql":
+                migrate_articles_without_rowid(conn)
+            conn.execute(COMPILED_QUERIES["CREATE_ARTICLES_TABLE"])
+            # PostgreSQL requires a unique index on a foreign key's target columns
+            conn.execute(COMPILED_QUERIES["CREATE_ARTICLE_ID_UNIQUE_INDEX"])
+            conn.execute(COMPILED_QUERIES["CREATE_ARTICLES_ANALYSES_TABLE"])
+            conn.execute(COMPILED_QUERIES["CREATE_SCORING_BATCHES_TABLE"])
+            conn.execute(COMPILED_QUERIES["CREATE_ANALYSIS_CACHE_TABLE"])
+            conn.execute(COMPILED_QUERIES["CREATE_SCHEMA_MIGRATIONS_TABLE"])
+            conn.execute(COMPILED_QUERIES["DROP_LEGACY_DATE_INDEX"])
+            conn.execute(COMPILED_QUERIES["CREATE_DATE_INDEX"])
+            conn.execute(COMPILED_QUERIES["CREATE_RELEVANCE_SCORE_INDEX"])
+            conn.execute(COMPILED_QUERIES["DROP_LEGACY_CATEGORY_INDEX"])
+            conn.execute(COMPILED_QUERIES["CREATE_CATEGORY_INDEX"])
+            create_recent_articles(conn)
+            migrate_article_id_hash(conn)
+            # PostgreSQL's autovacuum keeps planner statistics current on its own
+            if DATABASE_TYPE != "postgresql":
+                conn.execute(COMPILED_QUERIES["OPTIMIZE_DATABASE"])
             conn.commit()
 
+        _schema_ready = True
         db_info = DATABASE_URL if DATABASE_TYPE == "postgresql" else DATABASE_PATH
-        print(f"[INFO] Database initialized ({DATABASE_TYPE}): {db_info}")
+        logger.info("Database initialized (%s): %s", DATABASE_TYPE, db_info)
 
     except Exception as e:
-        print(f"[ERROR] Failed to create database: {e}")
+        logger.error("Failed to create database: %s", e)
         raise
 
 
-def generate_article_id(url: str) -> str:
-    """Generate a unique article ID from URL by hashing a cleaned version"""
-    if not url:
-        return ""
+def canonicalize_article_url(url: str) -> str:
+    """Lowercase a URL and strip its tracking parameters, fragment and params"""
+    lowered_url = url.lower().strip()
+    if (
+        lowered_url.startswith(("http://", "https://"))
+        and lowered_url.isascii()
+        and URL_PARSE_REQUIRED_CHARS.isdisjoint(lowered_url)
+    ):
+        return lowered_url
+
+    base_url, _, query = lowered_url.partition("?")
+    if (
+        base_url.startswith(("http://", "https://"))
+        and lowered_url.isascii()
+        and URL_PARSE_REQUIRED_CHARS.isdisjoint(base_url)
+        and SIMPLE_QUERY_PATTERN.fullmatch(query)
+    ):
+        pairs = query.split("&")
+        keys = [pair.partition("=")[0] for pair in pairs]
+        if len(set(keys)) == len(keys):
+            kept = [p for k, p in zip(keys, pairs) if k not in TRACKING_PARAMS]
+            return f"{base_url}?{'&'.join(kept)}" if kept else base_url
 
     try:
-        parsed = urlparse(url.lower().strip())
+        parsed = urlparse(lowered_url)
+        clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        if not parsed.query:
+            return clean_url
+
+        # Keys are already lowercase since the whole URL was lowered
         query_params = parse_qs(parsed.query)
         cleaned_params = {
-            k: v for k, v in query_params.items() if k.lower() not in TRACKING_PARAMS
+            k: v for k, v in query_params.items() if k not in TRACKING_PARAMS
         }
         cleaned_query = urlencode(cleaned_params, doseq=True)
-        clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
         if cleaned_query:
             clean_url += f"?{cleaned_query}"
-        return hashlib.md5(clean_url.encode("utf-8")).hexdigest()
+        return clean_url
 
     except Exception:
-        return hashlib.md5(url.encode("utf-8")).hexdigest()
+        return url
 
 
-def insert_article(
+@functools.lru_cache(maxsize=65536)
+def generate_article_id(url: str) -> str:
+    """Generate a unique article ID from URL by hashing a cleaned version"""
+    if not url:
+        return ""
+
+    clean_url = canonicalize_article_url(url)
+    return hashlib.blake2b(clean_url.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def generate_legacy_article_id(url: str) -> str:
+    """Generate the MD5-based article ID used before the switch to BLAKE2b"""
+    clean_url = canonicalize_article_url(url)
+    return hashlib.md5(clean_url.encode("utf-8")).hexdigest()
+
+
+def migrate_article_id_hash(conn) -> None:
+    """Rewrite MD5-based article IDs to BLAKE2b across all tables, once"""
+    migration_params = {"name": ARTICLE_ID_HASH_MIGRATION}
+    if conn.execute(
+        COMPILED_QUERIES["SCHEMA_MIGRATION_APPLIED"], migration_params
+    ).first():
+        return
+
+    # Checked per row, so a table left half-migrated by an older version is finished
+    article_params = []
+    analysis_params = []
+    for row in conn.execute(COMPILED_QUERIES["GET_ARTICLE_URLS"]).fetchall():
+        if row.article_id != generate_legacy_article_id(row.article_url):
+            continue
+        new_article_id = generate_article_id(row.article_url)
+        article_params.append(
+            {"source": row.source, "id": row.id, "new_article_id": new_article_id}
+        )
+        analysis_params.append(
+            {"article_id": row.article_id, "new_article_id": new_article_id}
+        )
+
+    if article_params:
+        logger.info(
+            "Migrating %s article IDs from MD5 to BLAKE2b...", len(article_params)
+        )
+        # PostgreSQL checks the foreign key after each UPDATE, and whichever
+        # side is rewritten first would briefly reference a missing article_id
+        if DATABASE_TYPE == "postgresql":
+            conn.execute(COMPILED_QUERIES["DROP_ANALYSIS_ARTICLE_FOREIGN_KEY"])
+        conn.execute(COMPILED_QUERIES["UPDATE_ARTICLE_ID"], article_params)
+        conn.execute(COMPILED_QUERIES["UPDATE_ANALYSIS_ARTICLE_ID"], analysis_params)
+
+        if DATABASE_TYPE == "postgresql":
+            conn.execute(COMPILED_QUERIES["ADD_ANALYSIS_ARTICLE_FOREIGN_KEY"])
+            conn.execute(COMPILED_QUERIES["REBUILD_RECENT_ARTICLES"])
+        else:
+            conn.execute(COMPILED_QUERIES["CLEAR_RECENT_ARTICLES"])
+            conn.execute(COMPILED_QUERIES["BACKFILL_RECENT_ARTICLES"])
+
+    # Recorded in the same transaction as the rewrite, so a crash repeats both
+    conn.execute(
+        COMPILED_QUERIES["INSERT_SCHEMA_MIGRATION"],
+        {
+            **migration_params,
+            "applied_at": datetime.now(timezone.utc).strftime(DATE_FORMAT),
+        },
+    )
+
+
+def prepare_article_params(
     parser: str,
     source: str,
     id: str,
@@ -240,8 +747,8 @@ def insert_article(
     content: Optional[str],
     date: str,
     article_url: str,
-) -> bool:
-    """Insert an article into the database with cleaned title and content"""
+) -> Optional[dict[str, Any]]:
+    """Validate and clean an article, returning its insert parameters"""
     required_fields = {
         "parser": parser,
         "source": source,
@@ -258,22 +765,22 @@ def insert_article(
     ]
 
     if missing_fields:
-        print(f"[ERROR] Missing required fields: {missing_fields}")
-        return False
+        logger.error("Missing required fields: %s", missing_fields)
+        return None
 
     generated_article_id = generate_article_id(article_url)
     if not generated_article_id:
-        print(f"[ERROR] Could not generate article_id from URL: {article_url}")
-        return False
+        logger.error("Could not generate article_id from URL: %s", article_url)
+        return None
 
     cleaned_title = clean_text(title)
     cleaned_content = clean_text(content)
 
     if not cleaned_title:
-        print("[ERROR] Title is empty after cleaning")
-        return False
+        logger.error("Title is empty after cleaning")
+        return None
 
-    params = {
+    return {
         "parser": parser.strip(),
         "source": source.strip(),
         "id": id.strip(),
@@ -286,112 +793,308 @@ def insert_article(
         "article_url": article_url.strip(),
     }
 
+
+def get_known_article_ids(conn) -> set[str]:
+    """Get the set of stored article_ids, loading it on first use"""
+    global _known_article_ids
+    if _known_article_ids is None:
+        with _known_article_ids_lock:
+            if _known_article_ids is None:
+                rows = conn.execute(COMPILED_QUERIES["GET_ARTICLE_IDS"]).scalars()
+                _known_article_ids = set(rows)
+    return _known_article_ids
+
+
+def insert_article(
+    parser: str,
+    source: str,
+    id: str,
+    subset: Optional[str],
+    thread_url: Optional[str],
+    title: str,
+    content: Optional[str],
+    date: str,
+    article_url: str,
+) -> bool:
+    """Insert an article into the database with cleaned title and content"""
+    article = {
+        "parser": parser,
+        "source": source,
+        "id": id,
+        "subset": subset,
+        "thread_url": thread_url,
+        "title": title,
+        "content": content,
+        "date": date,
+        "article_url": article_url,
+    }
+    return insert_articles([article]) > 0
+
+
+def copy_insert_articles(conn, params_list: list[dict[str, Any]]) -> int:
+    """Bulk load articles into PostgreSQL through COPY and a staging table"""
+    buffer = io.StringIO()
+    # QUOTE_NOTNULL keeps empty strings distinct from NULLs in COPY csv format
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+    for params in params_list:
+        writer.writerow([params[column] for column in ARTICLE_COLUMNS])
+    buffer.seek(0)
+
+    conn.execute(COMPILED_QUERIES["CREATE_ARTICLES_STAGING_TABLE"])
+    cursor = conn.connection.cursor()
     try:
-        with get_database_engine().connect() as conn:
-            result = conn.execute(text(QUERIES["INSERT_ARTICLE"]), params)
-            conn.commit()
-            return result.rowcount > 0
+        cursor.copy_expert(QUERIES["COPY_ARTICLES_STAGING"], buffer)
+    finally:
+        cursor.close()
+    result = conn.execute(COMPILED_QUERIES["INSERT_ARTICLES_FROM_STAGING"])
+    return result.rowcount
+
+
+def insert_articles(articles: list[dict[str, Any]]) -> int:
+    """Insert a batch of articles in a single transaction, returning the new row count"""
+    prepared = [prepare_article_params(**article) for article in articles]
+
+    try:
+        with writer_session() as conn:
+            # Articles already stored would be ignored by the insert anyway
+            known_article_ids = get_known_article_ids(conn)
+            params_list = [
+                params
+                for params in prepared
+                if params is not None and params["article_id"] not in known_article_ids
+            ]
+            if not params_list:
+                return 0
+
+            if DATABASE_TYPE == "postgresql" and len(params_list) > COPY_THRESHOLD:
+                inserted_count = copy_insert_articles(conn, params_list)
+            else:
+                result = conn.execute(COMPILED_QUERIES["INSERT_ARTICLE"], params_list)
+                inserted_count = result.rowcount
+
+        with _known_article_ids_lock:
+            known_article_ids.update(params["article_id"] for params in params_list)
+        return inserted_count
 
     except SQLAlchemyError as e:
-        print(f"[ERROR] Database error during insert: {e}")
-        return False
+        logger.error("Database error during bulk insert: %s", e)
+        return 0
 
 
 def get_recent_articles(
-    hours_back: int, min_relevance_score: int, category: int
+    hours_back: int,
+    min_relevance_score: int,
+    category: int,
+    title_max_length: int,
+    content_max_length: int,
 ) -> dict[str, dict]:
     """Get unique articles from the last N hours with specified relevance and category"""
+    # Dates are stored as UTC strings in DATE_FORMAT, which sort chronologically
+    date_cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
     query_params: dict[str, Any] = {
+        "date_cutoff": date_cutoff.strftime(DATE_FORMAT),
         "min_relevance": min_relevance_score,
         "category": category,
+        "title_max_length": title_max_length,
+        "content_max_length": content_max_length,
     }
 
-    if DATABASE_TYPE == "postgresql":
-        query_params["hours_back_interval"] = hours_back
-    else:
-        query_params["hours_back_delta_str"] = f"-{hours_back} hours"
-
     result_dict: dict[str, dict] = {}
 
     try:
-        with get_database_engine().connect() as conn:
-            rows = (
-                conn.execute(text(QUERIES["GET_RECENT_ARTICLES"]), query_params)
-                .mappings()
-                .fetchall()
+        with get_readonly_engine().connect() as conn:
+            rows = conn.execute(
+                COMPILED_QUERIES["GET_RECENT_ARTICLES"],
+                query_params,
+                execution_options={"yield_per": STREAM_BATCH_SIZE},
             )
             for row in rows:
-                article_id = row["article_id"]
-                if article_id not in result_dict:
-                    result_dict[article_id] = {
-                        "article_url": row["article_url"],
-                        "sources": [],
-                    }
-                result_dict[article_id]["sources"].append(dict(row))
+                result_dict[row.article_id] = {
+                    "article_url": row.article_url,
+                    "title": row.title,
+                    "content": row.content,
+                }
 
     except SQLAlchemyError as e:
-        print(f"[ERROR] Database error in get_recent_articles: {e}")
+        logger.error("Database error in get_recent_articles: %s", e)
 
     return result_dict
 
 
 def get_unanalysed_articles(limit: Optional[int] = None) -> dict[str, dict[str, Any]]:
     """Get unanalysed articles, grouped by article_id"""
-    sql_query_base = QUERIES["GET_UNANALYSED_ARTICLES"]
+    query = COMPILED_QUERIES["GET_UNANALYSED_ARTICLES"]
     query_params: dict[str, Any] = {}
 
     if limit is not None:
-        sql_query_final = sql_query_base + " LIMIT :limit_val"
+        query = COMPILED_QUERIES["GET_UNANALYSED_ARTICLES_LIMIT"]
         query_params["limit_val"] = limit
-    else:
-        sql_query_final = sql_query_base
 
     result_dict: dict[str, dict[str, Any]] = {}
 
     try:
-        with get_database_engine().connect() as conn:
-            rows = (
-                conn.execute(text(sql_query_final), query_params).mappings().fetchall()
+        with get_readonly_engine().connect() as conn:
+            rows = conn.execute(
+                query,
+                query_params,
+                execution_options={"yield_per": STREAM_BATCH_SIZE},
             )
             for row in rows:
-                article_id = row["article_id"]
+                article_id = row.article_id
                 if article_id not in result_dict:
                     result_dict[article_id] = {
-                        "article_url": row["article_url"],
+                        "article_url": row.article_url,
                         "sources": [],
                     }
                 result_dict[article_id]["sources"].append(
-                    {"title": row["title"], "content": row["content"]}
+                    {"title": row.title, "content": row.content}
                 )
 
     except SQLAlchemyError as e:
-        print(f"[ERROR] Database error in get_unanalysed_articles: {e}")
+        logger.error("Database error in get_unanalysed_articles: %s", e)
         return {}
 
     return result_dict
 
 
+def count_unanalysed_articles() -> int:
+    """Count articles that have no analysis yet"""
+    try:
+        with get_readonly_engine().connect() as conn:
+            return conn.execute(
+                COMPILED_QUERIES["COUNT_UNANALYSED_ARTICLES"]
+            ).scalar_one()
+
+    except SQLAlchemyError as e:
+        logger.error("Database error in count_unanalysed_articles: %s", e)
+        return 0
+
+
 def insert_article_analysis(analyses: list[tuple[str, int, int, list[str]]]) -> int:
     """Insert article analyses into the database"""
-    inserted_count = 0
+    if not analyses:
+        return 0
+
+    params_list = [
+        {
+            "article_id": article_id,
+            "relevance_score": relevance_score,
+            "category": category,
+            "tags": json.dumps(tags),
+        }
+        for article_id, relevance_score, category, tags in analyses
+    ]
 
     try:
-        with get_database_engine().connect() as conn:
-            for article_id, relevance_score, category, tags in analyses:
-                params = {
-                    "article_id": article_id,
-                    "relevance_score": relevance_score,
-                    "category": category,
-                    "tags": json.dumps(tags),
-                }
-                result = conn.execute(text(QUERIES["INSERT_ARTICLE_ANALYSIS"]), params)
-                inserted_count += result.rowcount
-            conn.commit()
+        with writer_session() as conn:
+            result = conn.execute(
+                COMPILED_QUERIES["INSERT_ARTICLE_ANALYSIS"], params_list
+            )
+        return result.rowcount
+
+    except SQLAlchemyError as e:
+        logger.error("Database error in insert_article_analysis: %s", e)
+        return 0
+
+
+def insert_scoring_batch(name: str, article_ids: list[list[str]]) -> None:
+    """Record a submitted Gemini batch job with the article IDs of each request"""
+    params = {
+        "name": name,
+        "article_ids": json.dumps(article_ids),
+        "created_at": datetime.now(timezone.utc).strftime(DATE_FORMAT),
+    }
+
+    try:
+        with writer_session() as conn:
+            conn.execute(COMPILED_QUERIES["INSERT_SCORING_BATCH"], params)
+
+    except SQLAlchemyError as e:
+        logger.error("Database error in insert_scoring_batch: %s", e)
+
+
+def get_scoring_batches() -> dict[str, list[list[str]]]:
+    """Get pending Gemini batch jobs, oldest first, keyed by job name"""
+    try:
+        with get_readonly_engine().connect() as conn:
+            rows = conn.execute(COMPILED_QUERIES["GET_SCORING_BATCHES"])
+            return {name: json.loads(article_ids) for name, article_ids in rows}
+
+    except SQLAlchemyError as e:
+        logger.error("Database error in get_scoring_batches: %s", e)
+        return {}
+
+
+def delete_scoring_batch(name: str) -> None:
+    """Forget a Gemini batch job once its results have been handled"""
+    try:
+        with writer_session() as conn:
+            conn.execute(COMPILED_QUERIES["DELETE_SCORING_BATCH"], {"name": name})
+
+    except SQLAlchemyError as e:
+        logger.error("Database error in delete_scoring_batch: %s", e)
+
+
+def get_cached_analyses(
+    content_hashes: list[str],
+) -> dict[str, tuple[int, int, list[str]]]:
+    """Get cached analyses keyed by article content hash"""
+    cached = {}
+
+    try:
+        with get_readonly_engine().connect() as conn:
+            for start in range(0, len(content_hashes), CACHE_LOOKUP_CHUNK_SIZE):
+                rows = conn.execute(
+                    COMPILED_QUERIES["GET_CACHED_ANALYSES"],
+                    {
+                        "content_hashes": content_hashes[
+                            start : start + CACHE_LOOKUP_CHUNK_SIZE
+                        ]
+                    },
+                )
+                for row in rows:
+                    cached[row.content_hash] = (
+                        row.relevance_score,
+                        row.category,
+                        json.loads(row.tags),
+                    )
 
     except SQLAlchemyError as e:
-        print(f"[ERROR] Database error in insert_article_analysis: {e}")
+        logger.error("Database error in get_cached_analyses: %s", e)
+        return {}
+
+    return cached
+
 
-    return inserted_count
+def insert_cached_analyses(analyses: list[tuple[str, int, int, list[str]]]) -> None:
+    """Remember analyses by article content hash so reruns can reuse them"""
+    if not analyses:
+        return
+
+    params_list = [
+        {
+            "content_hash": content_hash,
+            "relevance_score": relevance_score,
+            "category": category,
+            "tags": json.dumps(tags),
+        }
+        for content_hash, relevance_score, category, tags in analyses
+    ]
+
+    try:
+        with writer_session() as conn:
+            conn.execute(COMPILED_QUERIES["INSERT_CACHED_ANALYSIS"], params_list)
+
+    except SQLAlchemyError as e:
+        logger.error("Database error in insert_cached_analyses: %s", e)
+
+
+def get_relevance_band(relevance_score: int) -> str:
+    """Get the display band for a relevance score"""
+    for lower_bound, band in RELEVANCE_BANDS:
+        if relevance_score >= lower_bound:
+            return band
+    return "Very Low (0-19)"
 
 
 def get_database_stats() -> dict[str, Any]:
@@ -407,51 +1110,33 @@ def get_database_stats() -> dict[str, Any]:
     }
 
     try:
-        with get_database_engine().connect() as conn:
-            stats["total_articles"] = (
-                conn.execute(text(QUERIES["COUNT_TOTAL_ARTICLES"])).scalar_one_or_none()
-                or 0
-            )
-            stats["unique_articles"] = (
-                conn.execute(
-                    text(QUERIES["COUNT_UNIQUE_ARTICLES"])
-                ).scalar_one_or_none()
-                or 0
-            )
-            stats["by_parser"] = dict(
-                conn.execute(
-                    text(QUERIES["COUNT_BY_PARSER"])
-                ).fetchall()  # type: ignore
-            )
-            stats["by_source"] = dict(
-                conn.execute(
-                    text(QUERIES["COUNT_BY_SOURCE"])
-                ).fetchall()  # type: ignore
-            )
-            stats["unscored_articles"] = (
-                conn.execute(
-                    text(QUERIES["COUNT_UNSCORED_ARTICLES"])
-                ).scalar_one_or_none()
-                or 0
-            )
-            stats["by_relevance"] = dict(
-                conn.execute(
-                    text(QUERIES["STATS_BY_RELEVANCE"])
-                ).fetchall()  # type: ignore
-            )
-            stats["by_category"] = dict(
-                conn.execute(
-                    text(QUERIES["STATS_BY_CATEGORY"])
-                ).fetchall()  # type: ignore
-            )
+        with get_readonly_engine().connect() as conn:
+            # One statement, so every count comes from the same snapshot
+            for stat, label, count in conn.execute(
+                COMPILED_QUERIES["GET_DATABASE_STATS"]
+            ):
+                if stat == "summary":
+                    stats[label] = count
+                elif stat == "by_relevance":
+                    band = get_relevance_band(int(label))
+                    stats[stat][band] = stats[stat].get(band, 0) + count
+                elif stat == "by_category":
+                    name = CATEGORY_NAMES.get(int(label), "Unknown")
+                    stats[stat][name] = stats[stat].get(name, 0) + count
+                else:
+                    stats[stat][label] = count
 
     except SQLAlchemyError as e:
-        print(f"[ERROR] Database error in get_database_stats: {e}")
+        logger.error("Database error in get_database_stats: %s", e)
 
     return stats
 
 
 if __name__ == "__main__":
+    from readonly_ai.utils import setup_logging
+
+    setup_logging()
+
     try:
         create_database()
         db_stats = get_database_stats()
@@ -464,4 +1149,4 @@ if __name__ == "__main__":
             print("\n[INFO] Database is empty")
 
     except Exception as e:
-        print(f"[ERROR] Failed to initialize or show database stats: {e}")
+        logger.error("Failed to initialize or show database stats: %s", e)
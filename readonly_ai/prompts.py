@@ -2,6 +2,8 @@
 Prompt templates for AI analysis and summarization
 """
 
+from string import Template
+
 SCORING_PROMPT_TEMPLATE = """
 You are an **AI expert** tasked with **analyzing articles** for relevance to artificial intelligence, **categorizing them**, and **extracting relevant tags**.
 
@@ -57,26 +59,30 @@ Respond with **exactly $n objects** as a JSON array:
 
 
 SUMMARY_PROMPT_TEMPLATE = """
-You are an expert AI news editor. Your task is to generate a **concise and structured list** of AI news headlines based on the input data below.
+You are an expert AI news editor. Your task is to generate a **concise and structured list** of AI news headlines for each category in the input data below.
 
 **Instructions:**
 
-- Output a **JSON array of strings**. Each string is a **headline-style summary of one or more related news articles**.
+- Output a **JSON object** whose keys are the **category numbers** from the `[CATEGORY n]` markers. Each value is an **array of strings**, and each string is a **headline-style summary of one or more related news articles from that category**.
 - Write each string as a **single flowing sentence** using a **natural, journalistic tone**.
 - You **must integrate the link naturally** within the sentence using **Markdown syntax**. The linked text should be a **core part of the sentence**, never added at the end.
 - **Do not repeat** the same name/title twice in one sentence.
-- You **can group multiple articles** into a single summary if they are clearly related.
-- **Order the items by importance**, putting the most significant news first.
-- **Never output more than 10 items**.
-- **Keep the total word count under 600 words.**
+- You **can group multiple articles** into a single summary if they are clearly related, but **never mix categories**.
+- **Order the items by importance** within each category, putting the most significant news first.
+- **Never output more than 10 items** per category.
+- **Keep the word count under 600 words** per category.
 
 **Examples (good format + good link integration):**
 ```json
-[
-  "OpenAI introduced [GPT-4 Turbo](url), offering faster performance and lower cost for developers",
-  "Stanford researchers released the [Constitutional AI paper](url) advancing alignment techniques",
-  "Anthropic's [Claude 3.5 Sonnet](url) shows improved code generation and reasoning"
-]
+{
+  "1": [
+    "OpenAI introduced [GPT-4 Turbo](url), offering faster performance and lower cost for developers",
+    "Anthropic's [Claude 3.5 Sonnet](url) shows improved code generation and reasoning"
+  ],
+  "2": [
+    "Stanford researchers released the [Constitutional AI paper](url) advancing alignment techniques"
+  ]
+}
 ```
 
 **Examples (bad link integration — avoid these):**
@@ -87,7 +93,7 @@ You are an expert AI news editor. Your task is to generate a **concise and struc
 ]
 ```
 
-Now summarize the following news items:
+Now summarize the following news items, grouped by category:
 
 $content
 """.strip()
@@ -105,3 +111,9 @@ OUTPUT IN FRENCH LANGUAGE
 
 {SUMMARY_PROMPT_TEMPLATE}
 """.strip()
+
+
+# Compiled once so callers only substitute
+SCORING_PROMPT = Template(SCORING_PROMPT_TEMPLATE)
+SUMMARY_PROMPT_EN = Template(SUMMARY_PROMPT_TEMPLATE_EN)
+SUMMARY_PROMPT_FR = Template(SUMMARY_PROMPT_TEMPLATE_FR)
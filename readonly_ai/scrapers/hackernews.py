@@ -2,116 +2,174 @@
 HackerNews scraper for AI-related posts using Algolia search API
 """
 
-import requests
+import logging
+import asyncio
+import httpx
 from typing import Any
 from datetime import datetime, timedelta, timezone
 from readonly_ai.utils import is_valid_webpage_url, format_utc_datetime
-from readonly_ai.database import create_database, insert_article
+from readonly_ai.database import create_database, insert_articles
+
+logger = logging.getLogger(__name__)
 
 
 # Tags to exclude from HackerNews results
-HN_EXCLUDED_TAGS = ["show_hn", "ask_hn", "comment", "poll", "pollopt"]
+HN_EXCLUDED_TAGS = frozenset(["show_hn", "ask_hn", "comment", "poll", "pollopt"])
+
+HN_SEARCH_URL = "https://hn.algolia.com/api/v1/search"
+HN_REQUEST_TIMEOUT = 10
+HN_HITS_PER_PAGE = 50
+HN_MAX_PAGES = 5
+HN_MAX_CONNECTIONS = 10  # Keeps the concurrent searches under Algolia's rate limit
+
+
+async def fetch_hackernews_page(
+    client: httpx.AsyncClient, params: dict[str, Any], page: int
+) -> dict[str, Any]:
+    """Fetch a single page of Algolia search results"""
+    response = await client.get(HN_SEARCH_URL, params={**params, "page": page})
+    response.raise_for_status()
+    return response.json()
+
+
+async def search_hackernews(
+    client: httpx.AsyncClient, keyword: str, cutoff_timestamp: int
+) -> list[dict[str, Any]]:
+    """Run an Algolia story search for a keyword, fetching extra pages concurrently"""
+    params = {
+        "query": keyword,
+        "tags": "story",
+        "numericFilters": f"created_at_i>{cutoff_timestamp}",
+        "hitsPerPage": HN_HITS_PER_PAGE,
+    }
+
+    logger.debug("Searching for: %s", keyword)
+    first_page = await fetch_hackernews_page(client, params, 0)
+    hits = first_page.get("hits", [])
+
+    page_count = min(first_page.get("nbPages", 1), HN_MAX_PAGES)
+    if page_count > 1:
+        pages = await asyncio.gather(
+            *(
+                fetch_hackernews_page(client, params, page)
+                for page in range(1, page_count)
+            ),
+            return_exceptions=True,
+        )
+        for page, data in enumerate(pages, start=1):
+            if isinstance(data, Exception):
+                logger.error("Error fetching page %s for '%s': %s", page, keyword, data)
+                continue
+            hits.extend(data.get("hits", []))
 
+    return hits
 
-def get_hackernews_posts(hours_back: int, keywords: list[str]) -> list[dict[str, Any]]:
-    """Get recent AI-related posts from HackerNews using Algolia search API"""
+
+async def get_hackernews_posts_async(
+    hours_back: int, keywords: list[str]
+) -> list[dict[str, Any]]:
+    """Get recent AI-related posts from HackerNews, searching all keywords concurrently"""
     posts = []
     cutoff_timestamp = int(
         (datetime.now(timezone.utc) - timedelta(hours=hours_back)).timestamp()
     )
-    base_url = "https://hn.algolia.com/api/v1/search"
     seen_ids = set()
 
     # Search for each keyword individually for reliable results
-    for keyword in keywords:
-        params = {
-            "query": keyword,
-            "tags": "story",
-            "numericFilters": f"created_at_i>{cutoff_timestamp}",
-            "hitsPerPage": 50,
-            "page": 0,
-        }
-
-        try:
-            print(f"[DEBUG] Searching for: {keyword}")
-            response = requests.get(base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            for hit in data.get("hits", []):
-                hit_id = hit.get("objectID")
-                external_url = hit.get("url", "")
-                hit_tags = hit.get("_tags", [])
-
-                # Skip duplicates by HN ID
-                if hit_id in seen_ids:
-                    continue
-                seen_ids.add(hit_id)
-
-                # Skip if contains excluded tags
-                if any(excluded_tag in hit_tags for excluded_tag in HN_EXCLUDED_TAGS):
-                    continue
-
-                # Skip if no external URL or if it's not a valid webpage
-                if not external_url or not is_valid_webpage_url(external_url):
-                    continue
-
-                hn_thread_url = f"https://news.ycombinator.com/item?id={hit_id}"
-                created_timestamp = hit.get("created_at_i", 0)
-                created_time = datetime.fromtimestamp(
-                    created_timestamp, tz=timezone.utc
-                )
-
-                # Get text content if available (for Ask HN, Show HN posts)
-                content = hit.get("story_text", "") or ""
-
-                posts.append(
-                    {
-                        "id": hit_id,
-                        "title": hit.get("title", ""),
-                        "external_url": external_url,
-                        "hn_thread_url": hn_thread_url,
-                        "created": format_utc_datetime(created_time),
-                        "content": content,
-                        "keyword": keyword,
-                    }
-                )
-
-        except requests.RequestException as e:
-            print(f"[ERROR] Error searching for keyword '{keyword}': {e}")
+    # HTTP/2 multiplexes the searches over one connection; requests beyond the
+    # connection cap queue for a free connection, without a timeout
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(HN_REQUEST_TIMEOUT, pool=None),
+        limits=httpx.Limits(max_connections=HN_MAX_CONNECTIONS),
+    ) as client:
+        results = await asyncio.gather(
+            *(
+                search_hackernews(client, keyword, cutoff_timestamp)
+                for keyword in keywords
+            ),
+            return_exceptions=True,
+        )
+
+    for keyword, hits in zip(keywords, results):
+        if isinstance(hits, Exception):
+            logger.error("Error searching for keyword '%s': %s", keyword, hits)
             continue
 
+        for hit in hits:
+            hit_id = hit.get("objectID")
+            external_url = hit.get("url", "")
+            hit_tags = hit.get("_tags", [])
+
+            # Skip duplicates by HN ID
+            if hit_id in seen_ids:
+                continue
+            seen_ids.add(hit_id)
+
+            # Skip if contains excluded tags
+            if not HN_EXCLUDED_TAGS.isdisjoint(hit_tags):
+                continue
+
+            # Skip if no external URL or if it's not a valid webpage
+            if not external_url or not is_valid_webpage_url(external_url):
+                continue
+
+            hn_thread_url = f"https://news.ycombinator.com/item?id={hit_id}"
+            created_timestamp = hit.get("created_at_i", 0)
+            created_time = datetime.fromtimestamp(created_timestamp, tz=timezone.utc)
+
+            # Get text content if available (for Ask HN, Show HN posts)
+            content = hit.get("story_text", "") or ""
+
+            posts.append(
+                {
+                    "id": hit_id,
+                    "title": hit.get("title", ""),
+                    "external_url": external_url,
+                    "hn_thread_url": hn_thread_url,
+                    "created": format_utc_datetime(created_time),
+                    "content": content,
+                    "keyword": keyword,
+                }
+            )
+
     return posts
 
 
+def get_hackernews_posts(hours_back: int, keywords: list[str]) -> list[dict[str, Any]]:
+    """Get recent AI-related posts from HackerNews using Algolia search API"""
+    return asyncio.run(get_hackernews_posts_async(hours_back, keywords))
+
+
 def run_hackernews_scraper(hours_back: int, keywords: list[str]) -> None:
     """Run HackerNews scraper and save to database"""
-    print("[INFO] Running HackerNews scraper...")
+    logger.info("Running HackerNews scraper...")
 
     try:
         create_database()
         hn_posts = get_hackernews_posts(hours_back, keywords)
-        total_new_posts = 0
-
-        for post in hn_posts:
-            inserted = insert_article(
-                parser="hackernews",
-                source="hackernews",
-                id=post["id"],
-                subset=post["keyword"],
-                thread_url=post["hn_thread_url"],
-                title=post["title"],
-                content=post["content"],
-                date=post["created"],
-                article_url=post["external_url"],
-            )
-            if inserted:
-                total_new_posts += 1
 
-        print(
-            f"[INFO] HackerNews scraper completed. Added {total_new_posts} new posts to database."
+        articles = [
+            {
+                "parser": "hackernews",
+                "source": "hackernews",
+                "id": post["id"],
+                "subset": post["keyword"],
+                "thread_url": post["hn_thread_url"],
+                "title": post["title"],
+                "content": post["content"],
+                "date": post["created"],
+                "article_url": post["external_url"],
+            }
+            for post in hn_posts
+        ]
+        total_new_posts = insert_articles(articles)
+
+        logger.info(
+            "HackerNews scraper completed. Added %s new posts to database.",
+            total_new_posts,
         )
 
     except Exception as e:
-        print(f"[ERROR] HackerNews scraper failed: {e}")
+        logger.error("HackerNews scraper failed: %s", e)
         raise
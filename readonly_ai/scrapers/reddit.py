@@ -2,21 +2,26 @@
 Reddit scraper for AI-related posts with external links
 """
 
+import logging
+import asyncio
 from typing import Any
 from datetime import datetime, timedelta, timezone
 from readonly_ai.utils import setup_reddit, is_valid_webpage_url, format_utc_datetime
-from readonly_ai.database import create_database, insert_article
+from readonly_ai.database import create_database, insert_articles
 
+logger = logging.getLogger(__name__)
 
-def get_reddit_posts(
+
+async def get_reddit_posts(
     reddit, subreddit_name: str, hours_back: int
 ) -> list[dict[str, Any]]:
     """Get recent posts with external links from a subreddit"""
-    subreddit = reddit.subreddit(subreddit_name)
+    logger.info("Processing r/%s", subreddit_name)
+    subreddit = await reddit.subreddit(subreddit_name)
     posts = []
     cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
 
-    for post in subreddit.new(limit=100):
+    async for post in subreddit.new(limit=100):
         post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
         if post_time < cutoff_time:
             break
@@ -44,38 +49,60 @@ def get_reddit_posts(
     return posts
 
 
+async def get_all_reddit_posts(
+    subreddits: list[str], hours_back: int
+) -> list[list[dict[str, Any]]]:
+    """Fetch recent posts from all subreddits concurrently"""
+    async with setup_reddit() as reddit:
+        results = await asyncio.gather(
+            *(
+                get_reddit_posts(reddit, subreddit, hours_back)
+                for subreddit in subreddits
+            ),
+            return_exceptions=True,
+        )
+
+    subreddit_posts = []
+    for subreddit, result in zip(subreddits, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to scrape r/%s: %s", subreddit, result)
+            continue
+        subreddit_posts.append(result)
+
+    return subreddit_posts
+
+
 def run_reddit_scraper(hours_back: int, subreddits: list[str]) -> None:
     """Run Reddit scraper and save to database"""
-    print("[INFO] Running Reddit scraper...")
+    logger.info("Running Reddit scraper...")
 
     try:
         create_database()
-        reddit = setup_reddit()
-        total_new_posts = 0
-
-        for subreddit in subreddits:
-            print(f"[INFO] Processing r/{subreddit}")
-            posts = get_reddit_posts(reddit, subreddit, hours_back)
+        articles = []
+        subreddit_posts = asyncio.run(get_all_reddit_posts(subreddits, hours_back))
 
+        for posts in subreddit_posts:
             for post in posts:
-                inserted = insert_article(
-                    parser="reddit",
-                    source="reddit",
-                    id=post["id"],
-                    subset=post["subreddit"],
-                    thread_url=post["reddit_thread_url"],
-                    title=post["title"],
-                    content=post["content"],
-                    date=post["created"],
-                    article_url=post["external_url"],
+                articles.append(
+                    {
+                        "parser": "reddit",
+                        "source": "reddit",
+                        "id": post["id"],
+                        "subset": post["subreddit"],
+                        "thread_url": post["reddit_thread_url"],
+                        "title": post["title"],
+                        "content": post["content"],
+                        "date": post["created"],
+                        "article_url": post["external_url"],
+                    }
                 )
-                if inserted:
-                    total_new_posts += 1
 
-        print(
-            f"[INFO] Reddit scraper completed. Added {total_new_posts} new posts to database."
+        total_new_posts = insert_articles(articles)
+
+        logger.info(
+            "Reddit scraper completed. Added %s new posts to database.", total_new_posts
         )
 
     except Exception as e:
-        print(f"[ERROR] Reddit scraper failed: {e}")
+        logger.error("Reddit scraper failed: %s", e)
         raise
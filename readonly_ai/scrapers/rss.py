@@ -2,8 +2,11 @@
 RSS feed scraper for AI-related articles
 """
 
+import logging
+import asyncio
 import feedparser
 import dateutil.parser
+import httpx
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 from readonly_ai.utils import (
@@ -11,7 +14,12 @@ from readonly_ai.utils import (
     generate_article_id,
     format_utc_datetime,
 )
-from readonly_ai.database import create_database, insert_article
+from readonly_ai.database import create_database, insert_articles
+
+logger = logging.getLogger(__name__)
+
+RSS_REQUEST_TIMEOUT = 20
+RSS_STALE_ENTRY_LIMIT = 3  # Stale entries tolerated before a sorted feed is cut off
 
 
 def parse_date_fallback(date_string: Optional[str]) -> Optional[datetime]:
@@ -32,22 +40,36 @@ def parse_date_fallback(date_string: Optional[str]) -> Optional[datetime]:
         return None
 
 
+async def fetch_rss_feed(
+    client: httpx.AsyncClient, rss_url: str
+) -> tuple[bytes, dict[str, str]]:
+    """Download a single RSS feed body along with its response headers"""
+    response = await client.get(rss_url)
+    response.raise_for_status()
+    return response.content, dict(response.headers)
+
+
 def get_rss_posts(
-    source_name: str, rss_url: str, hours_back: int
+    source_name: str,
+    feed_body: bytes,
+    hours_back: int,
+    response_headers: Optional[dict[str, str]] = None,
+    newest_first: bool = True,
 ) -> list[dict[str, Any]]:
-    """Get recent posts from an RSS feed"""
-    feed = feedparser.parse(rss_url)
+    """Get recent posts from a downloaded RSS feed"""
+    feed = feedparser.parse(feed_body, response_headers=response_headers)
     posts = []
     cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+    stale_entries = 0
 
     for entry in feed.entries:
         published_time = None
 
         # First try feedparser's already-parsed times (most reliable)
         for time_field in ["published_parsed", "updated_parsed"]:
-            if hasattr(entry, time_field) and getattr(entry, time_field):
+            time_struct = entry.get(time_field)
+            if time_struct:
                 try:
-                    time_struct = getattr(entry, time_field)
                     published_time = datetime(*time_struct[:6], tzinfo=timezone.utc)
                     break
                 except Exception:
@@ -56,12 +78,20 @@ def get_rss_posts(
         # Only if feedparser couldn't parse it, try manual parsing
         if not published_time:
             for date_field in ["published", "updated", "created"]:
-                if hasattr(entry, date_field):
-                    date_string = getattr(entry, date_field)
+                date_string = entry.get(date_field)
+                if date_string is not None:
                     published_time = parse_date_fallback(date_string)
                     if published_time:
                         break
 
+        # Feeds list newest entries first, so once a few entries are older than the
+        # cutoff the rest are too; the slack absorbs an occasional out-of-order entry
+        if newest_first and published_time and published_time < cutoff_time:
+            stale_entries += 1
+            if stale_entries >= RSS_STALE_ENTRY_LIMIT:
+                break
+            continue
+
         if published_time and published_time >= cutoff_time:
             article_url = entry.link
             if is_valid_webpage_url(str(article_url)):
@@ -72,7 +102,7 @@ def get_rss_posts(
                         "id": article_id,
                         "title": entry.title,
                         "url": article_url,
-                        "content": (entry.summary if hasattr(entry, "summary") else ""),
+                        "content": entry.get("summary", ""),
                         "created": format_utc_datetime(published_time),
                         "source": source_name,
                     }
@@ -81,37 +111,97 @@ def get_rss_posts(
     return posts
 
 
-def run_rss_scraper(hours_back: int, rssfeeds: dict[str, str]) -> None:
+async def scrape_rss_feed(
+    client: httpx.AsyncClient,
+    source_name: str,
+    rss_url: str,
+    hours_back: int,
+    newest_first: bool,
+) -> list[dict[str, Any]]:
+    """Download a feed and parse it in a worker thread while other feeds download"""
+    feed_body, response_headers = await fetch_rss_feed(client, rss_url)
+    logger.info("Processing %s", source_name)
+    return await asyncio.to_thread(
+        get_rss_posts,
+        source_name,
+        feed_body,
+        hours_back,
+        response_headers,
+        newest_first,
+    )
+
+
+async def get_all_rss_posts(
+    rssfeeds: dict[str, str], hours_back: int, unsorted_feeds: list[str]
+) -> dict[str, list[dict[str, Any]]]:
+    """Fetch and parse all RSS feeds concurrently, skipping the ones that fail"""
+    async with httpx.AsyncClient(
+        timeout=RSS_REQUEST_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": feedparser.USER_AGENT},
+    ) as client:
+        results = await asyncio.gather(
+            *(
+                scrape_rss_feed(
+                    client,
+                    source_name,
+                    rss_url,
+                    hours_back,
+                    newest_first=source_name not in unsorted_feeds,
+                )
+                for source_name, rss_url in rssfeeds.items()
+            ),
+            return_exceptions=True,
+        )
+
+    feed_posts = {}
+    for (source_name, rss_url), result in zip(rssfeeds.items(), results):
+        if isinstance(result, Exception):
+            logger.error("Failed to scrape %s: %s", rss_url, result)
+            continue
+        feed_posts[source_name] = result
+
+    return feed_posts
+
+
+def run_rss_scraper(
+    hours_back: int,
+    rssfeeds: dict[str, str],
+    unsorted_feeds: Optional[list[str]] = None,
+) -> None:
     """Run RSS scraper and save to database"""
-    print("[INFO] Running RSS scraper...")
+    logger.info("Running RSS scraper...")
+    unsorted_feeds = unsorted_feeds or []
 
     try:
         create_database()
-        total_new_posts = 0
-
-        for source_name, rss_url in rssfeeds.items():
-            print(f"[INFO] Processing {source_name}")
-            posts = get_rss_posts(source_name, rss_url, hours_back)
+        articles = []
+        feed_posts = asyncio.run(
+            get_all_rss_posts(rssfeeds, hours_back, unsorted_feeds)
+        )
 
+        for source_name, posts in feed_posts.items():
             for post in posts:
-                inserted = insert_article(
-                    parser="rssfeed",
-                    source=source_name.lower().replace(" ", "_"),
-                    id=post["id"],
-                    subset=None,
-                    thread_url=None,
-                    title=post["title"],
-                    content=post["content"],
-                    date=post["created"],
-                    article_url=post["url"],
+                articles.append(
+                    {
+                        "parser": "rssfeed",
+                        "source": source_name.lower().replace(" ", "_"),
+                        "id": post["id"],
+                        "subset": None,
+                        "thread_url": None,
+                        "title": post["title"],
+                        "content": post["content"],
+                        "date": post["created"],
+                        "article_url": post["url"],
+                    }
                 )
-                if inserted:
-                    total_new_posts += 1
 
-        print(
-            f"[INFO] RSS scraper completed. Added {total_new_posts} new posts to database."
+        total_new_posts = insert_articles(articles)
+
+        logger.info(
+            "RSS scraper completed. Added %s new posts to database.", total_new_posts
         )
 
     except Exception as e:
-        print(f"[ERROR] RSS scraper failed: {e}")
+        logger.error("RSS scraper failed: %s", e)
         raise
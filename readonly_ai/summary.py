@@ -3,20 +3,37 @@ AI Daily News Summary Generator
 Generates markdown summaries of categorized AI articles using Gemini
 """
 
+import logging
 import os
+import re
 import json
+import hashlib
 import datetime
+import tempfile
+from typing import Optional
 from string import Template
 from google.genai import types
 from readonly_ai.utils import setup_gemini
-from readonly_ai.prompts import SUMMARY_PROMPT_TEMPLATE_EN, SUMMARY_PROMPT_TEMPLATE_FR
-from readonly_ai.database import create_database, get_recent_articles
+from readonly_ai.prompts import SUMMARY_PROMPT_EN, SUMMARY_PROMPT_FR
+from readonly_ai.database import (
+    create_database,
+    get_recent_articles,
+    refresh_recent_articles,
+)
+
+logger = logging.getLogger(__name__)
 
 # Constants
 MAX_RETRIES = 3
 TITLE_MAX_LENGTH = 200
 CONTENT_MAX_LENGTH = 200
 MAX_BULLET_POINTS = 10
+SUMMARY_MODEL = "gemini-2.0-flash"
+# Opt-in exact-prompt cache; only deterministic generations are safe to
+# replay, so enabling it also pins the temperature to 0
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARY_CACHE", "").lower() in ("1", "true", "yes")
+SUMMARY_TEMPERATURE = 0 if SUMMARY_CACHE_ENABLED else 0.4
+SUMMARY_CACHE_DIR = os.path.expanduser("~/.cache/readonly-ai/summary")
 
 CATEGORIES = {
     1: {"en": "New Models & Releases", "fr": "Nouveaux modèles et versions"},
@@ -26,103 +43,157 @@ CATEGORIES = {
     5: {"en": "Policy & Regulation", "fr": "Politiques et régulation"},
 }
 
+HEADER_TEMPLATES = {
+    "en": "# AI Daily News Report - {date}\n\n## Summary",
+    "fr": "# Revue Quotidienne de l'IA - {date}\n\n## Résumé",
+}
+
+PROMPT_TEMPLATES = {"en": SUMMARY_PROMPT_EN, "fr": SUMMARY_PROMPT_FR}
+
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]+")
+# Shorter titles such as "Weekly update" are too generic to mark a repost
+MIN_REPOST_TITLE_WORDS = 4
+REPOST_CONTENT_PREFIX_LENGTH = 100
+
 
 def generate_header(language: str) -> str:
     """Generate markdown header for the summary"""
     date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-
-    headers = {
-        "en": f"# AI Daily News Report - {date_str}\n\n## Summary",
-        "fr": f"# Revue Quotidienne de l'IA - {date_str}\n\n## Résumé",
-    }
-
-    return headers[language]
+    return HEADER_TEMPLATES[language].format(date=date_str)
 
 
-def get_prompt_template(language: str) -> str:
+def get_prompt_template(language: str) -> Template:
     """Get the appropriate prompt template for the language"""
-    if language == "en":
-        return SUMMARY_PROMPT_TEMPLATE_EN
-    elif language == "fr":
-        return SUMMARY_PROMPT_TEMPLATE_FR
-    else:
+    try:
+        return PROMPT_TEMPLATES[language]
+    except KeyError:
         raise ValueError(f"Unsupported language: {language}")
 
 
+def normalize_text(text: str) -> str:
+    """Normalize text for duplicate detection"""
+    return " ".join(PUNCTUATION_PATTERN.sub(" ", text.casefold()).split())
+
+
 def prepare_articles_for_prompt(articles: dict) -> list[str]:
     """Prepare articles data for the prompt"""
     articles_for_prompt = []
+    seen_reposts = set()
 
-    for article_id, data in articles.items():
-        article_url = data.get("article_url")
-        sources = data.get("sources", [])
-
-        if not article_url:
+    for data in articles.values():
+        if not data.get("article_url"):
             continue
 
-        titles = []
-        contents = []
-
-        for source in sources:
-            title = (source.get("title") or "").strip()
-            if title:
-                truncated_title = (
-                    title[:TITLE_MAX_LENGTH] + "..."
-                    if len(title) > TITLE_MAX_LENGTH
-                    else title
-                )
-                titles.append(truncated_title)
-
-            content = (source.get("content") or "").strip()
-            if content:
-                truncated_content = (
-                    content[:CONTENT_MAX_LENGTH] + "..."
-                    if len(content) > CONTENT_MAX_LENGTH
-                    else content
-                )
-                contents.append(truncated_content)
-
-        unique_titles = set(titles)
-        unique_contents = set(contents)
-
-        combined_title = " | ".join(unique_titles)
-        combined_content = " | ".join(unique_contents)
-
-        article_text = f"Article_url: {article_url}\nTitle: {combined_title or '-'}\nContent: {combined_content or '-'}"
-        articles_for_prompt.append(article_text)
+        # Reposts of a story under another URL add tokens but no information
+        title_key = normalize_text(data["title"] or "")
+        if len(title_key.split()) >= MIN_REPOST_TITLE_WORDS:
+            content_key = normalize_text(data["content"] or "")
+            repost_key = (title_key, content_key[:REPOST_CONTENT_PREFIX_LENGTH])
+            if repost_key in seen_reposts:
+                continue
+            seen_reposts.add(repost_key)
+
+        articles_for_prompt.append(
+            f"Article_url: {data['article_url']}\nTitle: {data['title'] or '-'}\nContent: {data['content'] or '-'}"
+        )
 
     return articles_for_prompt
 
 
-def generate_category_summary(client, content: str, language: str) -> list[str]:
-    """Generate summary for a category with retry logic"""
-    template = Template(get_prompt_template(language))
-    prompt = template.substitute(content=content)
+def get_summary_cache_path(prompt: str) -> str:
+    """Get the cache file path for a summary prompt"""
+    cache_key = f"{SUMMARY_MODEL}\n{SUMMARY_TEMPERATURE}\n{prompt}"
+    key = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+    return os.path.join(SUMMARY_CACHE_DIR, f"{key}.json")
+
 
+def load_cached_summary(cache_path: str) -> Optional[dict[str, list[str]]]:
+    """Load cached bullet points for a prompt, if any"""
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_summary(cache_path: str, bullet_points: dict[str, list[str]]) -> None:
+    """Atomically write bullet points to the summary cache"""
+    try:
+        os.makedirs(SUMMARY_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=SUMMARY_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(bullet_points, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.error("Failed to cache summary: %s", e)
+
+
+def build_summary_schema(category_ids: list[int]) -> dict:
+    """Build the response schema mapping each category ID to its bullet points"""
+    keys = [str(category_id) for category_id in category_ids]
+    return {
+        "type": "object",
+        "properties": {
+            key: {"type": "array", "items": {"type": "string"}} for key in keys
+        },
+        "required": keys,
+    }
+
+
+def request_summaries(client, prompt: str, category_ids: list[int]) -> dict:
+    """Request the bullet points for every category with retry logic"""
     for attempt in range(MAX_RETRIES):
         try:
             response = client.models.generate_content(
-                model="gemini-2.0-flash",
+                model=SUMMARY_MODEL,
                 contents=prompt,
                 config=types.GenerateContentConfig(
-                    temperature=0.4,
+                    temperature=SUMMARY_TEMPERATURE,
                     response_mime_type="application/json",
-                    response_schema={
-                        "type": "array",
-                        "items": {"type": "string"},
-                    },
+                    response_schema=build_summary_schema(category_ids),
                 ),
             )
-
-            bullet_points = json.loads(response.text or "[]")
-            return bullet_points[:MAX_BULLET_POINTS]
+            return json.loads(response.text or "{}")
 
         except Exception as e:
-            print(f"[ERROR] Summary generation attempt {attempt + 1} failed: {e}")
+            logger.error("Summary generation attempt %s failed: %s", attempt + 1, e)
             if attempt == MAX_RETRIES - 1:
                 raise
 
-    return []
+    return {}
+
+
+def generate_summaries(
+    client, category_contents: dict[int, str], language: str
+) -> dict[int, list[str]]:
+    """Summarize every category in a single call"""
+    content = "\n\n".join(
+        f"[CATEGORY {category_id}]\n{category_content}"
+        for category_id, category_content in category_contents.items()
+    )
+    prompt = get_prompt_template(language).substitute(content=content)
+
+    cache_path = None
+    bullet_points = None
+    if SUMMARY_CACHE_ENABLED:
+        cache_path = get_summary_cache_path(prompt)
+        bullet_points = load_cached_summary(cache_path)
+
+    if bullet_points is not None:
+        logger.info("Using cached summary")
+    else:
+        bullet_points = request_summaries(client, prompt, list(category_contents))
+        # A partial response would otherwise be replayed on every later run
+        complete = all(
+            str(category_id) in bullet_points for category_id in category_contents
+        )
+        if cache_path and complete:
+            save_cached_summary(cache_path, bullet_points)
+
+    return {
+        category_id: bullet_points.get(str(category_id), [])[:MAX_BULLET_POINTS]
+        for category_id in category_contents
+    }
 
 
 def write_summary_file(content: str, language: str) -> None:
@@ -141,84 +212,96 @@ def write_summary_file(content: str, language: str) -> None:
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(content)
 
-        print(f"[INFO] Summary saved to {filepath}")
+        logger.info("Summary saved to %s", filepath)
 
     except Exception as e:
-        print(f"[ERROR] Failed to write summary file: {e}")
+        logger.error("Failed to write summary file: %s", e)
         raise
 
 
-def process_category(
-    client,
+def get_category_content(
     category_id: int,
-    category_names: dict,
+    category_name: str,
     hours_back: int,
     min_relevance_score: int,
-    language: str,
 ) -> str:
-    """Process a single category and return its markdown section"""
-    category_name_en = category_names["en"]
-    category_name_localized = category_names[language]
-
-    print(f"[INFO] Processing category: {category_name_en} (ID: {category_id})")
+    """Build the prompt content for a single category"""
+    logger.info("Processing category: %s (ID: %s)", category_name, category_id)
 
-    articles = get_recent_articles(hours_back, min_relevance_score, category_id)
+    articles = get_recent_articles(
+        hours_back,
+        min_relevance_score,
+        category_id,
+        TITLE_MAX_LENGTH,
+        CONTENT_MAX_LENGTH,
+    )
 
     if not articles:
-        print(f"[INFO] No articles found for {category_name_en}")
+        logger.info("No articles found for %s", category_name)
         return ""
 
     articles_for_prompt = prepare_articles_for_prompt(articles)
 
     if not articles_for_prompt:
-        print(f"[INFO] No valid content to summarize for {category_name_en}")
+        logger.info("No valid content to summarize for %s", category_name)
         return ""
 
-    content_for_prompt = "\n\n---\n\n".join(articles_for_prompt)
+    return "\n\n---\n\n".join(articles_for_prompt)
 
-    try:
-        client = setup_gemini()
-        bullet_points = generate_category_summary(client, content_for_prompt, language)
 
-        section = f"### {category_name_localized}\n\n"
-        for point in bullet_points:
-            section += f"- {point}\n"
-        section += "\n"
+def generate_category_sections(
+    client, hours_back: int, min_relevance_score: int, language: str
+) -> list[str]:
+    """Generate every category's markdown section, in category order"""
+    category_contents = {}
+    for category_id, category_names in CATEGORIES.items():
+        content = get_category_content(
+            category_id, category_names["en"], hours_back, min_relevance_score
+        )
+        if content:
+            category_contents[category_id] = content
 
-        return section
+    if not category_contents:
+        return []
 
+    try:
+        summaries = generate_summaries(client, category_contents, language)
     except Exception as e:
-        print(f"[ERROR] Failed to generate summary for {category_name_en}: {e}")
-        section = f"### {category_name_localized}\n\n*Could not generate summary for this category due to an error.*\n\n"
-        return section
+        logger.error("Failed to generate summaries: %s", e)
+        return [
+            f"### {CATEGORIES[category_id][language]}\n\n*Could not generate summary for this category due to an error.*\n\n"
+            for category_id in category_contents
+        ]
+
+    sections = []
+    for category_id, bullet_points in summaries.items():
+        bullets = "".join(f"- {point}\n" for point in bullet_points)
+        sections.append(f"### {CATEGORIES[category_id][language]}\n\n{bullets}\n")
+
+    return sections
 
 
 def run_summary_generator(
     hours_back: int, min_relevance_score: int, language: str
 ) -> None:
     """Run the summary generator and save results"""
-    print("[INFO] Starting AI news summary generation...")
+    logger.info("Starting AI news summary generation...")
 
     try:
         create_database()
+        refresh_recent_articles()
         client = setup_gemini()
 
-        markdown_summary = f"{generate_header(language)}\n\n"
-
-        for category_id, category_names in CATEGORIES.items():
-            category_section = process_category(
-                client,
-                category_id,
-                category_names,
-                hours_back,
-                min_relevance_score,
-                language,
-            )
-            markdown_summary += category_section
+        category_sections = generate_category_sections(
+            client, hours_back, min_relevance_score, language
+        )
+        markdown_summary = f"{generate_header(language)}\n\n" + "".join(
+            category_sections
+        )
 
         write_summary_file(markdown_summary, language)
-        print("[INFO] Summary generation completed successfully")
+        logger.info("Summary generation completed successfully")
 
     except Exception as e:
-        print(f"[ERROR] Summary generation failed: {e}")
+        logger.error("Summary generation failed: %s", e)
         raise
@@ -1,12 +1,70 @@
 import os
-import praw
+import re
+import sys
+import logging
 import hashlib
+import functools
 from datetime import datetime, timezone
-from google import genai
+from typing import TYPE_CHECKING
+
+# The SDKs are slow to import, so each is only loaded by the command needing it
+if TYPE_CHECKING:
+    import asyncpraw
+    from google import genai
+
+LOG_FORMAT = "[%(levelname)s] %(message)s"
+# Third-party loggers that report every HTTP request at INFO
+QUIET_LOGGERS = ["httpx", "httpcore", "google_genai", "asyncpraw", "asyncprawcore"]
+
+GEMINI_TIMEOUT_MS = 120_000
+GEMINI_MAX_KEEPALIVE_CONNECTIONS = 10
+
+# File extensions to exclude (not webpages), matched before any query string
+EXCLUDED_URL_EXTENSIONS = [
+    "jpg",
+    "jpeg",
+    "png",
+    "gif",
+    "webp",
+    "svg",
+    "bmp",  # Images
+    "mp4",
+    "avi",
+    "mov",
+    "mkv",
+    "webm",
+    "flv",  # Videos
+    "pdf",
+    "doc",
+    "docx",
+    "ppt",
+    "pptx",  # Documents
+    "zip",
+    "rar",
+    "tar",
+    "gz",  # Archives
+    "mp3",
+    "wav",
+    "flac",
+    "ogg",  # Audio
+]
+
+WEBPAGE_URL_PATTERN = re.compile(
+    r"https?://(?![^?]*\.(?ai:%s)(?:\?|\Z))" % "|".join(EXCLUDED_URL_EXTENSIONS)
+)
+
+
+def setup_logging() -> None:
+    """Setup console logging in the same format as the CLI's own messages"""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, stream=sys.stdout)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def setup_reddit() -> "asyncpraw.Reddit":
+    """Setup async Reddit API connection"""
+    import asyncpraw
 
-
-def setup_reddit() -> praw.Reddit:
-    """Setup Reddit API connection"""
     client_id = os.getenv("REDDIT_CLIENT_ID")
     client_secret = os.getenv("REDDIT_CLIENT_SECRET")
 
@@ -15,68 +73,47 @@ def setup_reddit() -> praw.Reddit:
     if not client_secret:
         raise ValueError("REDDIT_CLIENT_SECRET environment variable is required")
 
-    return praw.Reddit(
+    return asyncpraw.Reddit(
         client_id=client_id,
         client_secret=client_secret,
         user_agent="readonly-ai/1.0",
     )
 
 
-def setup_gemini() -> genai.Client:
-    """Setup Gemini API client"""
+@functools.lru_cache(maxsize=1)
+def setup_gemini() -> "genai.Client":
+    """Setup the Gemini API client shared by every request in the process"""
+    import httpx
+    from google import genai
+    from google.genai import types
+
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("GEMINI_API_KEY environment variable is required")
-    return genai.Client(api_key=api_key)
+
+    # An explicit transport keeps async calls on the client's pooled httpx
+    # connections; otherwise the SDK opens a new aiohttp session per request
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(max_keepalive_connections=GEMINI_MAX_KEEPALIVE_CONNECTIONS)
+    )
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            timeout=GEMINI_TIMEOUT_MS,
+            async_client_args={"transport": transport},
+        ),
+    )
 
 
 def is_valid_webpage_url(url: str) -> bool:
     """Check if URL is likely a webpage (not image, video, etc.)"""
-    if not url or not url.startswith(("http://", "https://")):
-        return False
-
-    # File extensions to exclude (not webpages)
-    excluded_extensions = {
-        ".jpg",
-        ".jpeg",
-        ".png",
-        ".gif",
-        ".webp",
-        ".svg",
-        ".bmp",  # Images
-        ".mp4",
-        ".avi",
-        ".mov",
-        ".mkv",
-        ".webm",
-        ".flv",  # Videos
-        ".pdf",
-        ".doc",
-        ".docx",
-        ".ppt",
-        ".pptx",  # Documents
-        ".zip",
-        ".rar",
-        ".tar",
-        ".gz",  # Archives
-        ".mp3",
-        ".wav",
-        ".flac",
-        ".ogg",  # Audio
-    }
-
-    # Check file extension
-    parsed_url = url.lower().split("?")[0]  # Remove query parameters
-    for ext in excluded_extensions:
-        if parsed_url.endswith(ext):
-            return False
-
-    return True
+    return bool(url) and WEBPAGE_URL_PATTERN.match(url) is not None
 
 
+@functools.lru_cache(maxsize=65536)
 def generate_article_id(url: str) -> str:
     """Generate a consistent article ID from URL"""
-    return hashlib.md5(str(url).encode()).hexdigest()[:16]
+    return hashlib.blake2s(url.encode("utf-8"), digest_size=8).hexdigest()
 
 
 def format_utc_datetime(dt: datetime) -> str:
@@ -84,7 +121,8 @@ def format_utc_datetime(dt: datetime) -> str:
     if dt.tzinfo is None:
         # Assume naive datetime is UTC
         dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    # isoformat skips strftime's format parsing; dropping "+00:00" leaves DATE_FORMAT
+    return dt.astimezone(timezone.utc).isoformat(" ", "seconds")[:19]
 
 
 def get_current_utc_string() -> str:
@@ -103,6 +141,5 @@ def truncate_text(text: str, max_length: int) -> str:
 
 
 def combine_unique_texts(texts: list[str], separator: str = " | ") -> str:
-    """Combine unique non-empty texts with separator"""
-    unique_texts = sorted(set(t.strip() for t in texts if t and t.strip()))
-    return separator.join(unique_texts) if unique_texts else ""
+    """Combine unique non-empty texts with separator, in first-seen order"""
+    return separator.join(dict.fromkeys(s for t in texts if t and (s := t.strip())))